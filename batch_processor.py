@@ -1,16 +1,83 @@
 """
 批量文件处理器，继承自ReportGenerator
 """
-import shutil
+import os
+import logging
+import importlib.util
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from collections import Counter, defaultdict
+import weakref
+import numpy as np
 import pandas as pd
 import re
 
 from report_generator import ReportGenerator
 from config_manager import config
 from logger_config import LoggerConfig
-from utils import FileUtils, DataUtils, ExcelUtils
+from utils import FileUtils, DataUtils, ExcelUtils, CacheUtils
+
+# 统计报告中需要按值计数的列
+_COUNT_COLUMNS = ('文件来源', '类型', '修复状态')
+
+# 不同值占比低于该比例的文本列转换为category类型
+_CATEGORY_RATIO = 0.5
+
+# 安装了pyarrow时，高基数文本列使用Arrow存储的字符串类型
+_HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# object列的infer_dtype结果为这些类型时，pyarrow可以直接写入parquet
+_PARQUET_INFERRED = frozenset(['string', 'empty', 'integer', 'floating', 'mixed-integer-float',
+                               'boolean', 'date', 'datetime', 'decimal', 'bytes'])
+
+# 列名中的重复后缀，如“严重级别.1”“严重级别_1”
+_DOT_SUFFIX = re.compile(r'\.\d+$')
+_UND_SUFFIX = re.compile(r'_\d+$')
+
+logger = LoggerConfig.get_logger('BatchProcessor')
+
+def _process_one_file(file_path, use_cache, cache_dir, include_source, timestamp):
+    """
+    读取、清理并预处理单个Excel文件，定义在模块级别以便进程池序列化调用
+    
+    清理结果按文件缓存，重复运行时未修改的文件不再重新解析；
+    元数据列、列名清理和分析列在子进程中完成，合并时无需再逐文件串行处理。
+    spawn方式启动的子进程会按默认值重建全局配置，因此缓存和元数据列的设置由主进程显式传入
+    
+    Args:
+        file_path (str): Excel文件路径
+        use_cache (bool): 是否读写缓存
+        cache_dir (str): 缓存目录，不使用缓存时为None
+        include_source (bool): 是否添加文件来源列
+        timestamp (str): 处理时间列的值，不添加该列时为None
+        
+    Returns:
+        tuple: (文件名, DataFrame或None, 为空时的说明)
+    """
+    filename = Path(file_path).name
+    
+    # 输入文件未修改时直接使用缓存的清理结果
+    df = CacheUtils.load_dataframe(file_path, cache_dir=cache_dir) if use_cache else None
+    
+    if df is None:
+        df = ExcelUtils.read_excel_smart(file_path)
+        
+        if df.empty:
+            return filename, None, "读取为空"
+        
+        # 清理无用列和空行
+        df = DataUtils.clean_dataframe(df)
+        
+        if df.empty:
+            return filename, None, "清理后为空"
+        
+        if use_cache:
+            CacheUtils.save_dataframe(file_path, df, cache_dir=cache_dir)
+    
+    # 元数据列、列名清理和分析列（处理时间每次重新生成，因此不写入缓存）
+    return filename, BatchProcessor._prepare_frame(df, file_path, include_source, timestamp), None
 
 class BatchProcessor(ReportGenerator):
     """批量文件处理器，继承自ReportGenerator"""
@@ -19,13 +86,15 @@ class BatchProcessor(ReportGenerator):
         super().__init__()
         self.input_folder = config.get_folder_path('input') if input_folder is None else Path(input_folder)
         self.logger = LoggerConfig.get_logger(self.__class__.__name__)
+        # 最近一次merge_data逐文件累加的统计信息：(合并结果的弱引用, 统计信息)
+        self._merge_statistics = None
     
     def read_all_files(self):
         """
-        读取所有Excel文件
+        读取并预处理所有Excel文件，多个文件时使用进程池并行处理
         
         Returns:
-            dict: 文件名到DataFrame的映射
+            dict: 文件名到DataFrame（已清理列名并添加分析列）的映射
         """
         xlsx_files = FileUtils.get_excel_files(str(self.input_folder))
         
@@ -33,33 +102,91 @@ class BatchProcessor(ReportGenerator):
             self.logger.warning(f"在 {self.input_folder} 中没有找到Excel文件")
             return {}
         
+        file_paths = [str(file_path) for file_path in xlsx_files]
+        results = self._read_files(file_paths)
+        
+        # 按文件顺序整理结果，保证合并顺序稳定
         file_data = {}
+        for path in file_paths:
+            if path not in results:
+                continue
+            name, df, reason = results[path]
+            if df is None:
+                self.logger.warning(f"文件 {name} {reason}")
+            else:
+                file_data[name] = df
+                self.logger.info("成功处理文件: %s, %d 行数据", name, len(df))
+        
+        self.logger.info(f"成功读取 {len(file_data)} 个文件")
+        return file_data
+    
+    def _read_files(self, file_paths):
+        """
+        读取文件，多个文件时使用进程池并行读取，进程池不可用时顺序读取
+        
+        Args:
+            file_paths (list): 文件路径列表
+            
+        Returns:
+            dict: 文件路径到 (文件名, DataFrame, 说明) 的映射，出错的文件不包含在内
+        """
+        max_workers = config.get_excel_config().get('max_workers') or os.cpu_count() or 1
+        max_workers = min(max_workers, len(file_paths))
         
-        for file_path in xlsx_files:
+        # 缓存和元数据列的设置在主进程按当前配置确定，作为参数传给子进程
+        cache_dir = CacheUtils.get_cache_dir()
+        use_cache = cache_dir is not None
+        cache_dir = str(cache_dir.resolve()) if use_cache else None
+        report_config = config.get_report_config()
+        include_source = report_config.get('include_source_column', True)
+        # 所有文件使用本次运行的同一个处理时间，合并后该列仍只有一个类别
+        timestamp = (datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                     if report_config.get('include_timestamp', True) else None)
+        args = (use_cache, cache_dir, include_source, timestamp)
+        
+        if max_workers > 1:
             try:
-                df = ExcelUtils.read_excel_smart(str(file_path))
-                
-                if not df.empty:
-                    # 清理数据
-                    df = self.clean_data(df)
-                    
-                    if not df.empty:
-                        # 添加元数据
-                        df = DataUtils.add_metadata_columns(df, str(file_path))
-                        file_data[file_path.name] = df
-                        self.logger.info(f"成功处理文件: {file_path.name}, {len(df)} 行数据")
-                    else:
-                        self.logger.warning(f"文件 {file_path.name} 清理后为空")
-                else:
-                    self.logger.warning(f"文件 {file_path.name} 读取为空")
-                    
+                return self._read_files_parallel(file_paths, max_workers, args)
+            except BrokenProcessPool as e:
+                self.logger.warning(f"并行读取失败，改为顺序读取: {e}")
+        
+        results = {}
+        for path in file_paths:
+            try:
+                results[path] = _process_one_file(path, *args)
             except Exception as e:
-                self.logger.error(f"处理文件 {file_path.name} 时出错: {e}")
+                self.logger.error(f"处理文件 {Path(path).name} 时出错: {e}")
+        return results
+    
+    def _read_files_parallel(self, file_paths, max_workers, args):
+        """
+        使用进程池并行读取文件，大文件优先提交，避免最后只剩一个大文件在单核上解析
         
-        self.logger.info(f"成功读取 {len(file_data)} 个文件")
-        return file_data
+        Args:
+            file_paths (list): 文件路径列表
+            max_workers (int): 最大进程数
+            args (tuple): 传给 _process_one_file 的其余参数（缓存和元数据列的设置）
+            
+        Returns:
+            dict: 文件路径到 (文件名, DataFrame, 说明) 的映射
+        """
+        results = {}
+        ordered_paths = sorted(file_paths, key=lambda path: os.path.getsize(path) if os.path.exists(path) else 0,
+                               reverse=True)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_process_one_file, path, *args): path for path in ordered_paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    results[path] = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    self.logger.error(f"处理文件 {Path(path).name} 时出错: {e}")
+        return results
     
-    def _clean_column_names(self, df):
+    @staticmethod
+    def _clean_column_names(df):
         """
         清理列名，处理异常列名问题
         
@@ -74,98 +201,55 @@ class BatchProcessor(ReportGenerator):
                 return df
             
             original_columns = list(df.columns)
-            self.logger.info(f"原始列名: {original_columns}")
-            
-            # 清理列名
-            new_columns = []
-            for col in df.columns:
-                if isinstance(col, str):
-                    clean_col = col
-                    
-                    # 处理Unnamed列名
-                    if clean_col.startswith('Unnamed:'):
-                        # 尝试从第一行数据中获取有意义的列名
-                        if len(df) > 0 and pd.notna(df.iloc[0][col]):
-                            first_value = str(df.iloc[0][col])
-                            if first_value and not first_value.isdigit():
-                                clean_col = first_value[:20]  # 限制长度
-                            else:
-                                clean_col = f"列{len(new_columns)+1}"
-                        else:
-                            clean_col = f"列{len(new_columns)+1}"
-                    
-                    # 处理重复后缀（如严重级别_1）
-                    clean_col = re.sub(r'\.\d+$', '', clean_col)  # 移除.1, .2等
-                    clean_col = re.sub(r'_\d+$', '', clean_col)   # 移除_1, _2等
-                    
-                    # 处理特殊异常列名映射
-                    # 已根据用户要求取消映射
-                    column_mapping = {}
-                    
-                    if clean_col in column_mapping:
-                        clean_col = column_mapping[clean_col]
-                    
-                    # 移除之前添加的额外处理逻辑，统一通过column_mapping处理
-                    # 添加额外的严重级别列名处理
-                    # if '严重级别' in clean_col and clean_col != '严重级别':
-                    #     clean_col = '严重级别'
-                    
-                    new_columns.append(clean_col)
-                else:
-                    new_columns.append(str(col))
+            logger.info("原始列名: %s", original_columns)
             
             # 新增判断：如果2列名相同，检查下每列下面是否有值，没有的话，不要对该列做处理，只保留有数据的列
-            columns_to_drop = []
-            
-            # 在原始列名中查找重复的列
-            original_column_counts = {}
-            for col in original_columns:
-                original_column_counts[col] = original_column_counts.get(col, 0) + 1
-            
-            # 对于原始列名中重复的列，检查每列下面是否有值
-            for col, count in original_column_counts.items():
-                if count > 1:  # 如果原始列名重复
-                    # 找到所有同名列的索引
-                    duplicate_indices = [i for i, c in enumerate(original_columns) if c == col]
-                    
-                    # 检查每列是否有数据，只保留有数据的列
-                    has_data_indices = []
-                    for idx in duplicate_indices:
-                        # 检查该列是否有非空值
-                        if not (df.iloc[:, idx].isnull().all() or (df.iloc[:, idx].astype(str).str.strip() == '').all()):
-                            has_data_indices.append(idx)
+            drop_positions = []
+            
+            # 在原始列名中查找重复的列，记录每个列名对应的所有位置
+            column_positions = defaultdict(list)
+            for idx, col in enumerate(original_columns):
+                column_positions[col].append(idx)
+            duplicate_groups = {col: indices for col, indices in column_positions.items() if len(indices) > 1}
+            
+            if duplicate_groups:
+                # 判断所有重复列是否有数据
+                positions = [idx for indices in duplicate_groups.values() for idx in indices]
+                has_data = {idx: BatchProcessor._column_has_data(df.iloc[:, idx]) for idx in positions}
+                
+                for col, indices in duplicate_groups.items():
+                    has_data_indices = [idx for idx in indices if has_data[idx]]
                     
                     # 如果有多个有数据的列，只保留第一个
                     if has_data_indices:
-                        # 删除其他有数据的列（保留第一个）
-                        for idx in has_data_indices[1:]:
-                            columns_to_drop.append(original_columns[idx])
+                        drop_positions.extend(has_data_indices[1:])
                     # 如果没有有数据的列，保留第一个列（删除其他所有）
                     else:
-                        for idx in duplicate_indices[1:]:
-                            columns_to_drop.append(original_columns[idx])
+                        drop_positions.extend(indices[1:])
             
-            # 删除不需要的列
-            if columns_to_drop:
-                # 先删除列，再进行列名清理
-                for col_name in columns_to_drop:
-                    if col_name in df.columns:
-                        df = df.drop(col_name, axis=1)
-                self.logger.info(f"已删除没有数据的重复列: {columns_to_drop}")
+            # 按位置删除不需要的列，避免按列名删除时把同名的保留列一并删除
+            if drop_positions:
+                columns_to_drop = [original_columns[idx] for idx in drop_positions]
+                keep_mask = np.ones(len(original_columns), dtype=bool)
+                keep_mask[drop_positions] = False
+                df = df.iloc[:, keep_mask]
+                logger.info("已删除没有数据的重复列: %s", columns_to_drop)
             
             # 清理列名（在删除重复列之后）
             new_columns = []
             # 跟踪已使用的列名以避免重复
             used_column_names = set()
-            for col in df.columns:
+            # 第一行数据只取一次，按列位置访问
+            first_row = df.iloc[0].tolist() if len(df) > 0 else None
+            for idx, col in enumerate(df.columns):
                 if isinstance(col, str):
                     clean_col = col
                     
                     # 处理Unnamed列名
                     if clean_col.startswith('Unnamed:'):
                         # 尝试从第一行数据中获取有意义的列名
-                        if len(df) > 0 and pd.notna(df.iloc[0][col]):
-                            first_value = str(df.iloc[0][col])
+                        if first_row is not None and pd.notna(first_row[idx]):
+                            first_value = str(first_row[idx])
                             if first_value and not first_value.isdigit():
                                 clean_col = first_value[:20]  # 限制长度
                             else:
@@ -174,8 +258,8 @@ class BatchProcessor(ReportGenerator):
                             clean_col = f"列{len(new_columns)+1}"
                     
                     # 处理重复后缀（如严重级别_1）
-                    clean_col = re.sub(r'\.\d+$', '', clean_col)  # 移除.1, .2等
-                    clean_col = re.sub(r'_\d+$', '', clean_col)   # 移除_1, _2等
+                    clean_col = _DOT_SUFFIX.sub('', clean_col)  # 移除.1, .2等
+                    clean_col = _UND_SUFFIX.sub('', clean_col)  # 移除_1, _2等
                     
                     # 处理特殊异常列名映射
                     # 已根据用户要求取消映射
@@ -199,31 +283,90 @@ class BatchProcessor(ReportGenerator):
             # 应用清理后的列名
             df.columns = new_columns
             
-            # 重新获取清理后的列名
-            cleaned_columns = list(df.columns)
-            self.logger.info(f"清理后列名: {cleaned_columns}")
-            
-            # 记录清理的变化
-            changes = []
-            for orig, clean in zip(original_columns, cleaned_columns):
-                if str(orig) != str(clean):
-                    changes.append(f"{orig} -> {clean}")
-            
-            if changes:
-                self.logger.info(f"列名清理变化: {changes}")
+            # 记录清理的变化（每个文件都会调用，日志级别高于INFO时跳过逐列比较）
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("清理后列名: %s", new_columns)
+                
+                changes = []
+                for orig, clean in zip(original_columns, new_columns):
+                    if str(orig) != str(clean):
+                        changes.append(f"{orig} -> {clean}")
+                
+                if changes:
+                    logger.info("列名清理变化: %s", changes)
             
             return df
             
         except Exception as e:
-            self.logger.error(f"清理列名时出错: {e}")
+            logger.error(f"清理列名时出错: {e}")
             return df
     
+    @staticmethod
+    def _column_has_data(series):
+        """
+        判断列中是否有非空、非空白的值
+        
+        先用空值位图判断最常见的整列为空的情况，只有object列才逐个检查字符串
+        
+        Args:
+            series (pd.Series): 列数据
+            
+        Returns:
+            bool: 是否有数据
+        """
+        non_null = series.dropna()
+        if non_null.empty:
+            return False
+        if non_null.dtype != object:
+            return True
+        return not non_null.map(lambda x: isinstance(x, str) and not x.strip()).all()
+    
+    @staticmethod
+    def _prepare_frame(df, file_path, include_source, timestamp):
+        """
+        合并前处理单个文件的数据，在读取文件的子进程中调用；顺序与原有流程一致：
+        先添加元数据列，再清理列名，最后添加分析列，列名冲突时按同样的规则去重
+        
+        Args:
+            df (pd.DataFrame): 已清理无用列和空行的单个文件数据
+            file_path (str): 源文件路径
+            include_source (bool): 是否添加文件来源列
+            timestamp (str): 处理时间列的值，为None时不添加该列
+            
+        Returns:
+            pd.DataFrame: 处理后的数据
+        """
+        # 数据由本进程独占，直接插入列，避免assign再复制整个DataFrame
+        if include_source:
+            # 整列都是同一个文件名，用只有一个类别的category列存储，每行只占一个字节
+            df['文件来源'] = DataUtils.constant_column(Path(file_path).name, len(df))
+        
+        if timestamp is not None:
+            df['处理时间'] = DataUtils.constant_column(timestamp, len(df))
+        
+        df = BatchProcessor._clean_column_names(df)
+        
+        # 类型列默认为非程序Bug，修复状态列默认为未修复
+        new_columns = {}
+        if '类型' not in df.columns:
+            new_columns['类型'] = DataUtils.default_analysis_column('类型', len(df))
+        if '修复状态' not in df.columns:
+            new_columns['修复状态'] = DataUtils.default_analysis_column('修复状态', len(df))
+        elif df['修复状态'].isna().any():
+            new_columns['修复状态'] = df['修复状态'].fillna('未修复')
+        
+        for col, value in new_columns.items():
+            df[col] = value
+        
+        logger.info("已添加列: %s", list(new_columns))
+        return df
+    
     def merge_data(self, file_data_dict):
         """
-        合并多个文件的数据
+        合并多个文件的数据，同时逐文件累加统计信息供统计报告使用
         
         Args:
-            file_data_dict (dict): 文件名到DataFrame的映射
+            file_data_dict (dict): read_all_files返回的文件名到DataFrame的映射
             
         Returns:
             pd.DataFrame: 合并后的数据
@@ -233,22 +376,19 @@ class BatchProcessor(ReportGenerator):
             return pd.DataFrame()
         
         try:
-            # 在合并前对每个DataFrame进行列名清理和默认值设置
-            cleaned_dataframes = []
-            for filename, df in file_data_dict.items():
-                # 清理列名
-                df = self._clean_column_names(df)
-                
-                # 添加分析列并设置默认值
-                df = DataUtils.add_analysis_columns(df)
-                
-                # 重置索引以确保没有重复索引问题
-                df = df.reset_index(drop=True)
-                
-                cleaned_dataframes.append(df)
-            
-            # 使用concat合并，忽略索引
-            merged_df = pd.concat(cleaned_dataframes, ignore_index=True, sort=False)
+            # 列名清理和默认值设置已在读取文件时并行完成，这里只累加统计信息
+            statistics = self._new_statistics()
+            for df in file_data_dict.values():
+                self._accumulate_statistics(statistics, df)
+            
+            merged_df = self._concat_frames(list(file_data_dict.values()), list(statistics['column_rows']))
+            # 类型统计按优化前的类型计算，报告内容不受内存优化影响
+            dtype_counts = DataUtils.dtype_counts(merged_df)
+            merged_df = self._optimize_dtypes(merged_df)
+            merge_statistics = self._finalize_statistics(statistics)
+            self._merge_statistics = (weakref.ref(merged_df), merge_statistics)
+            self._seed_frame_profile(merged_df, missing_counts=merge_statistics['missing_counts'],
+                                     dtype_counts=dtype_counts)
             
             self.logger.info(f"成功合并数据，总计 {len(merged_df)} 行")
             
@@ -262,9 +402,101 @@ class BatchProcessor(ReportGenerator):
             self.logger.error(f"合并数据时出错: {e}")
             return pd.DataFrame()
     
+    @staticmethod
+    def _concat_frames(frames, columns):
+        """
+        按行合并多个DataFrame
+        
+        列不一致时先统一对齐到合并后的列，避免concat逐个数据块重新对齐；
+        所有列都是文本（object/category）时预分配一个object数组，逐列复制各文件的数据，
+        不生成对齐后的中间副本，只构造一次DataFrame
+        
+        Args:
+            frames (list): DataFrame列表
+            columns (list): 合并后的列顺序
+            
+        Returns:
+            pd.DataFrame: 合并后的数据，索引为新的连续索引
+        """
+        # 只有一个文件时不需要合并：浅复制后设置连续索引，后续修改列不会影响读取结果
+        if len(frames) == 1:
+            merged_df = frames[0].copy(deep=False)
+            merged_df.index = pd.RangeIndex(len(merged_df))
+            return merged_df
+        
+        # 列完全一致时concat本身不需要对齐，ignore_index直接生成连续索引
+        if all(list(df.columns) == columns for df in frames):
+            return pd.concat(frames, ignore_index=True, sort=False, copy=False)
+        
+        text_only = all(dtype == object or isinstance(dtype, pd.CategoricalDtype)
+                        for df in frames for dtype in df.dtypes)
+        if text_only:
+            positions = {col: pos for pos, col in enumerate(columns)}
+            values = np.full((sum(len(df) for df in frames), len(columns)), np.nan, dtype=object)
+            offset = 0
+            for df in frames:
+                end = offset + len(df)
+                for idx, col in enumerate(df.columns):
+                    values[offset:end, positions[col]] = df.iloc[:, idx].to_numpy(dtype=object)
+                offset = end
+            return pd.DataFrame(values, columns=columns)
+        
+        aligned = [df.reindex(columns=columns) for df in frames]
+        return pd.concat(aligned, ignore_index=True, sort=False, copy=False)
+    
+    def _optimize_dtypes(self, df):
+        """
+        压缩合并后数据的内存占用：纯数值的object列转为数值类型，
+        重复值较多的文本列转为category类型，其余文本列在安装了pyarrow时转为Arrow字符串；
+        整数列不向下转换，保持与读取结果相同的类型
+        
+        Args:
+            df (pd.DataFrame): 合并后的数据
+            
+        Returns:
+            pd.DataFrame: 转换类型后的数据
+        """
+        if df.empty:
+            return df
+        
+        try:
+            converted = {'numeric': [], 'category': [], 'string': []}
+            columns = {}
+            
+            for col in df.columns:
+                series = df[col]
+                
+                if series.dtype == object:
+                    inferred = pd.api.types.infer_dtype(series, skipna=True)
+                    # 只转换真正的数值，字符串形式的数字（如编号"001"）保持原样
+                    if inferred in ('integer', 'floating', 'mixed-integer-float'):
+                        series = pd.to_numeric(series)
+                        converted['numeric'].append(col)
+                    elif inferred == 'string':
+                        if series.nunique() < len(series) * _CATEGORY_RATIO:
+                            series = series.astype('category')
+                            converted['category'].append(col)
+                        elif _HAS_PYARROW:
+                            series = series.astype('string[pyarrow]')
+                            converted['string'].append(col)
+                columns[col] = series
+            
+            # 一次性构造新的DataFrame，相同类型的列合并为连续的数据块；
+            # 逐列赋值会把合并时的大数据块拆成许多小块，后续按列扫描变慢
+            df = pd.DataFrame(columns, index=df.index)
+            
+            self.logger.info(f"数据类型优化完成: 数值列 {converted['numeric']}，category列 {converted['category']}，"
+                           f"Arrow字符串列 {converted['string']}")
+            return df
+            
+        except Exception as e:
+            self.logger.error(f"优化数据类型时出错: {e}")
+            return df
+    
     def generate_reports(self, merged_df, processed_files=None):
         """
-        生成各种报告
+        生成各种报告；三个报告都读取同一个merged_df，pandas的读取操作也不保证线程安全，
+        因此在当前线程依次生成和写入
         
         Args:
             merged_df (pd.DataFrame): 合并后的数据
@@ -277,102 +509,305 @@ class BatchProcessor(ReportGenerator):
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             
-            # 1. 保存合并数据（详细分析报告）
-            merged_filename = f"详细分析报告_{timestamp}.xlsx"
-            merged_path = self.output_folder / merged_filename
+            statistics = self._get_merge_statistics(merged_df)
             
-            if ExcelUtils.save_excel_with_sheets(str(merged_path), {'详细分析报告': merged_df}):
-                self.logger.info(f"已保存详细分析报告到: {merged_filename}")
+            # 1. 保存合并数据（详细分析报告）
+            merged_path = self._save_detail_report(merged_df, timestamp)
+            if merged_path:
+                self.logger.info(f"已保存详细分析报告到: {merged_path.name}")
             
             # 2. 生成统计报告
-            stats_filename = f"数据统计报告_{timestamp}.xlsx"
-            stats_path = self.output_folder / stats_filename
-            
-            stats_data = self._generate_statistics_report(merged_df, processed_files)
-            if ExcelUtils.save_excel_with_sheets(str(stats_path), {'统计数据': stats_data}):
-                self.logger.info(f"已生成统计报告: {stats_filename}")
+            self._save_statistics_report(
+                self._generate_statistics_report(merged_df, processed_files, statistics), timestamp)
             
             # 3. 生成统一分析报告
             unified_report_path = self.generate_unified_report(merged_df, f"批量分析_{timestamp}")
-            
             if unified_report_path:
                 self.logger.info(f"已生成统一分析报告: {unified_report_path.name}")
             
         except Exception as e:
             self.logger.error(f"生成报告时出错: {e}")
     
-    def _generate_statistics_report(self, merged_df, processed_files):
+    def _save_detail_report(self, merged_df, timestamp):
+        """
+        按配置的格式保存完整的合并数据
+        
+        Args:
+            merged_df (pd.DataFrame): 合并后的数据
+            timestamp (str): 文件名时间戳
+            
+        Returns:
+            Path: 保存的文件路径，失败时返回None
+        """
+        configured_format = config.get_report_config().get('detail_format', 'xlsx')
+        detail_format = FileUtils.get_detail_format()
+        if detail_format != str(configured_format).lower().lstrip('.'):
+            self.logger.warning(f"详细分析报告格式 {configured_format} 不可用（支持xlsx、csv、parquet，"
+                                f"parquet需要安装pyarrow），改为保存为xlsx")
+        
+        merged_path = self.output_folder / f"详细分析报告_{timestamp}.{detail_format}"
+        try:
+            if detail_format == 'parquet':
+                self._parquet_compatible(merged_df).to_parquet(merged_path, index=False, compression='zstd')
+            elif detail_format == 'csv':
+                # utf-8-sig 使Excel能正确识别中文
+                merged_df.to_csv(merged_path, index=False, encoding='utf-8-sig')
+            elif not ExcelUtils.save_excel_with_sheets(str(merged_path), {'详细分析报告': merged_df}):
+                return None
+            return merged_path
+            
+        except Exception as e:
+            self.logger.error(f"保存详细分析报告时出错: {e}")
+            return None
+    
+    @staticmethod
+    def _parquet_compatible(df):
+        """
+        将混合类型的object列转为文本，pyarrow无法把一列中的数字和文本等不同类型写入同一列
+        
+        Args:
+            df (pd.DataFrame): 合并后的数据
+            
+        Returns:
+            pd.DataFrame: 可写入parquet的数据，没有需要转换的列时为原数据
+        """
+        converted = None
+        for idx in range(len(df.columns)):
+            series = df.iloc[:, idx]
+            if series.dtype != object:
+                continue
+            if pd.api.types.infer_dtype(series, skipna=True) in _PARQUET_INFERRED:
+                continue
+            if converted is None:
+                converted = df.copy(deep=False)
+            # 只转换非空值，缺失值仍写为null
+            converted.isetitem(idx, series.astype(str).where(series.notna()))
+        return df if converted is None else converted
+    
+    def _save_statistics_report(self, stats_data, timestamp):
+        """
+        保存统计报告
+        
+        Args:
+            stats_data (pd.DataFrame): 统计数据
+            timestamp (str): 文件名时间戳
+            
+        Returns:
+            Path: 统计报告路径，失败时返回None
+        """
+        stats_path = self.output_folder / f"数据统计报告_{timestamp}.xlsx"
+        if ExcelUtils.save_excel_with_sheets(str(stats_path), {'统计数据': stats_data}):
+            self.logger.info(f"已生成统计报告: {stats_path.name}")
+            return stats_path
+        return None
+    
+    @staticmethod
+    def _stats_rows(rows):
+        """
+        将若干 [统计项, 值] 行转换为统计DataFrame
+        
+        Args:
+            rows (list): 统计行列表
+            
+        Returns:
+            pd.DataFrame: 统计数据
+        """
+        return pd.DataFrame(rows, columns=['统计项', '值'])
+    
+    @staticmethod
+    def _stats_counts(counts, total=None):
+        """
+        将计数Series向量化转换为统计DataFrame，统计项前加两个空格缩进
+        
+        Args:
+            counts (pd.Series): 以统计项为索引的计数
+            total (int): 总数，提供时值格式为 "数量 (百分比%)"
+            
+        Returns:
+            pd.DataFrame: 统计数据
+        """
+        labels = '  ' + counts.index.astype(str)
+        if total:
+            rates = (counts / total * 100).map('{:.1f}'.format)
+            values = counts.astype(str) + ' (' + rates + '%)'
+        else:
+            values = counts
+        return pd.DataFrame({'统计项': labels.to_numpy(), '值': values.to_numpy()})
+    
+    @staticmethod
+    def _new_statistics():
+        """
+        创建逐文件累加的统计信息
+        
+        Returns:
+            dict: 空的统计累加器
+        """
+        return {
+            'total_rows': 0,
+            'column_rows': {},  # 列名 -> 包含该列的文件行数之和，按首次出现顺序
+            'null_counts': Counter(),
+            'value_counts': {col: Counter() for col in _COUNT_COLUMNS},
+            'present_columns': set()
+        }
+    
+    @staticmethod
+    def _accumulate_statistics(statistics, df):
+        """
+        将单个文件的统计信息累加到统计累加器，只需扫描该文件的数据
+        
+        Args:
+            statistics (dict): 统计累加器
+            df (pd.DataFrame): 单个文件的数据
+        """
+        rows = len(df)
+        statistics['total_rows'] += rows
+        for col in df.columns:
+            statistics['column_rows'][col] = statistics['column_rows'].get(col, 0) + rows
+        statistics['null_counts'].update(DataUtils.count_nulls(df).to_dict())
+        
+        for col in _COUNT_COLUMNS:
+            if col in df.columns:
+                statistics['present_columns'].add(col)
+                # 不排序的分组计数，排序在汇总时统一进行；observed只统计出现过的类别
+                counts = df.groupby(col, sort=False, observed=True).size()
+                statistics['value_counts'][col].update(counts.to_dict())
+    
+    @staticmethod
+    def _finalize_statistics(statistics):
+        """
+        将统计累加器转换为统计报告使用的统计信息，重复行数由统计报告根据合并数据计算
+        
+        Args:
+            statistics (dict): 统计累加器
+            
+        Returns:
+            dict: 统计信息
+        """
+        total_rows = statistics['total_rows']
+        column_rows = statistics['column_rows']
+        
+        # 合并后，不包含某列的文件的行在该列上均为空值
+        missing_counts = pd.Series(
+            [statistics['null_counts'][col] + total_rows - rows for col, rows in column_rows.items()],
+            index=pd.Index(list(column_rows), dtype=object), dtype='int64')
+        
+        value_counts = {
+            col: pd.Series(dict(counter.most_common()), dtype='int64')
+            for col, counter in statistics['value_counts'].items()
+            if col in statistics['present_columns']
+        }
+        
+        return {
+            'total_rows': total_rows,
+            'total_columns': len(column_rows),
+            'missing_counts': missing_counts,
+            'duplicate_count': None,
+            'value_counts': value_counts
+        }
+    
+    def _frame_statistics(self, df):
+        """
+        直接从DataFrame计算统计信息，缺失值计数与其他报告共用
+        
+        Args:
+            df (pd.DataFrame): 数据
+            
+        Returns:
+            dict: 统计信息
+        """
+        value_counts = {}
+        for col in _COUNT_COLUMNS:
+            if col in df.columns:
+                value_counts[col] = DataUtils.value_counts_stable(df[col])
+        
+        return {
+            'total_rows': len(df),
+            'total_columns': len(df.columns),
+            'missing_counts': self._get_frame_profile(df)['missing_counts'],
+            'duplicate_count': None,
+            'value_counts': value_counts
+        }
+    
+    def _get_merge_statistics(self, merged_df):
+        """
+        获取merge_data为该合并结果累加的统计信息
+        
+        Args:
+            merged_df (pd.DataFrame): 合并后的数据
+            
+        Returns:
+            dict: 统计信息，不是由最近一次merge_data生成的数据时返回None
+        """
+        if self._merge_statistics is None:
+            return None
+        
+        merged_ref, statistics = self._merge_statistics
+        return statistics if merged_ref() is merged_df else None
+    
+    def _generate_statistics_report(self, merged_df, processed_files, statistics=None):
         """
         生成统计报告数据
         
         Args:
             merged_df (pd.DataFrame): 合并后的数据
             processed_files (list): 处理的文件列表
+            statistics (dict): 预先计算的统计信息，为None时从merged_df计算
             
         Returns:
             pd.DataFrame: 统计数据
         """
         try:
-            stats_data = []
+            if statistics is None:
+                statistics = self._frame_statistics(merged_df)
+            
+            total_rows = statistics['total_rows']
+            value_counts = statistics['value_counts']
+            separator = ['', '']  # 空行分隔
             
             # 基本统计
-            stats_data.append(['处理时间', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-            stats_data.append(['处理文件数', len(processed_files) if processed_files else 0])
-            stats_data.append(['总数据行数', len(merged_df)])
-            stats_data.append(['总数据列数', len(merged_df.columns)])
+            sections = [self._stats_rows([
+                ['处理时间', datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
+                ['处理文件数', len(processed_files) if processed_files else 0],
+                ['总数据行数', total_rows],
+                ['总数据列数', statistics['total_columns']]
+            ])]
             
             # 文件来源统计
-            if '文件来源' in merged_df.columns:
-                source_counts = merged_df['文件来源'].value_counts()
-                stats_data.append(['', ''])  # 空行分隔
-                stats_data.append(['文件来源统计', ''])
-                for source, count in source_counts.items():
-                    stats_data.append([f'  {source}', count])
-            
-            # 数据质量统计
-            stats_data.append(['', ''])  # 空行分隔
-            stats_data.append(['数据质量统计', ''])
-            
-            # 缺失值统计
-            missing_counts = merged_df.isnull().sum()
+            if '文件来源' in value_counts:
+                sections.append(self._stats_rows([separator, ['文件来源统计', '']]))
+                sections.append(self._stats_counts(value_counts['文件来源']))
+            
+            # 数据质量统计 - 缺失值统计
+            missing_counts = statistics['missing_counts']
             total_missing = missing_counts.sum()
-            stats_data.append(['总缺失值数', total_missing])
+            sections.append(self._stats_rows([separator, ['数据质量统计', ''], ['总缺失值数', total_missing]]))
             
             if total_missing > 0:
-                stats_data.append(['缺失值详情', ''])
-                for col, missing_count in missing_counts.items():
-                    if missing_count > 0:
-                        missing_rate = (missing_count / len(merged_df)) * 100
-                        stats_data.append([f'  {col}', f'{missing_count} ({missing_rate:.1f}%)'])
+                sections.append(self._stats_rows([['缺失值详情', '']]))
+                sections.append(self._stats_counts(missing_counts[missing_counts > 0], total_rows))
             
             # 重复值统计
-            duplicate_count = merged_df.duplicated().sum()
-            stats_data.append(['重复行数', duplicate_count])
+            duplicate_count = statistics['duplicate_count']
+            if duplicate_count is None:
+                duplicate_count = self._get_frame_profile(merged_df)['duplicate_count']
+            sections.append(self._stats_rows([['重复行数', duplicate_count]]))
             
             # 新增列统计
-            if '类型' in merged_df.columns:
-                stats_data.append(['', ''])  # 空行分隔
-                stats_data.append(['Bug类型统计', ''])
-                type_counts = merged_df['类型'].value_counts()
-                for bug_type, count in type_counts.items():
-                    percentage = (count / len(merged_df)) * 100
-                    stats_data.append([f'  {bug_type}', f'{count} ({percentage:.1f}%)'])
-            
-            if '修复状态' in merged_df.columns:
-                stats_data.append(['', ''])  # 空行分隔
-                stats_data.append(['修复状态统计', ''])
-                status_counts = merged_df['修复状态'].value_counts()
-                for status, count in status_counts.items():
-                    percentage = (count / len(merged_df)) * 100
-                    stats_data.append([f'  {status}', f'{count} ({percentage:.1f}%)'])
+            if '类型' in value_counts:
+                sections.append(self._stats_rows([separator, ['Bug类型统计', '']]))
+                sections.append(self._stats_counts(value_counts['类型'], total_rows))
+            
+            if '修复状态' in value_counts:
+                status_counts = value_counts['修复状态']
+                sections.append(self._stats_rows([separator, ['修复状态统计', '']]))
+                sections.append(self._stats_counts(status_counts, total_rows))
                 
                 # 计算修复率
                 if '已修复' in status_counts:
-                    total_bugs = len(merged_df)
-                    fix_rate = (status_counts['已修复'] / total_bugs) * 100
-                    stats_data.append(['总体修复率', f'{fix_rate:.1f}%'])
+                    fix_rate = (status_counts['已修复'] / total_rows) * 100
+                    sections.append(self._stats_rows([['总体修复率', f'{fix_rate:.1f}%']]))
             
-            return pd.DataFrame(stats_data, columns=['统计项', '值'])
+            return pd.concat(sections, ignore_index=True)
             
         except Exception as e:
             self.logger.error(f"生成统计报告数据时出错: {e}")
@@ -402,8 +837,9 @@ class BatchProcessor(ReportGenerator):
                 self.logger.error("数据合并失败")
                 return False
             
-            # 3. 生成报告
+            # 3. 生成报告；合并后不再需要逐文件的数据，释放引用以降低生成报告时的内存占用
             processed_files = list(file_data.keys())
+            del file_data
             self.generate_reports(merged_df, processed_files)
             
             self.logger.info("批量处理完成！")
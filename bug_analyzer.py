@@ -1,6 +1,7 @@
 """
 Bug分析器类，继承自ExcelProcessor
 """
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
@@ -8,7 +9,7 @@ from datetime import datetime
 from excel_processor import ExcelProcessor
 from config_manager import config
 from logger_config import LoggerConfig
-from utils import FileUtils, DataUtils, TextUtils
+from utils import FileUtils, DataUtils, TextUtils, ExcelUtils
 
 class BugAnalyzer(ExcelProcessor):
     """Bug分析器类，继承自ExcelProcessor"""
@@ -17,6 +18,26 @@ class BugAnalyzer(ExcelProcessor):
         super().__init__(input_folder, output_folder)
         self.latest_report_file = None
         self.logger = LoggerConfig.get_logger(self.__class__.__name__)
+        # 列检测结果只取决于列名，按列名元组缓存，按日期和按类型分析共用
+        self._bug_col_cache = {}
+    
+    def _col_info(self, df):
+        """
+        获取Bug相关列和日期列的检测结果，相同列名的数据只检测一次
+        
+        Args:
+            df (pd.DataFrame): 数据
+            
+        Returns:
+            dict: DataUtils.detect_bug_columns 的结果，另含 date_column
+        """
+        key = tuple(df.columns)
+        column_info = self._bug_col_cache.get(key)
+        if column_info is None:
+            column_info = DataUtils.detect_bug_columns(df)
+            column_info['date_column'] = DataUtils.find_column(key, ('日期', 'date', '时间'))
+            self._bug_col_cache[key] = column_info
+        return column_info
     
     def find_latest_report(self):
         """
@@ -54,20 +75,20 @@ class BugAnalyzer(ExcelProcessor):
             return pd.DataFrame()
         
         try:
-            # 尝试读取指定工作表，如果失败则尝试其他可能的工作表名
-            possible_sheets = [sheet_name, '详细数据', '完整数据', 'Sheet1']
-            
-            for sheet in possible_sheets:
-                try:
-                    df = pd.read_excel(report_file, sheet_name=sheet)
+            # 只打开一次工作簿，按工作表名选择，避免逐个尝试时重复解析文件
+            with pd.ExcelFile(report_file) as excel_file:
+                sheet_names = excel_file.sheet_names
+                possible_sheets = [sheet_name, '详细数据', '完整数据', 'Sheet1']
+                sheet = next((name for name in possible_sheets if name in sheet_names), None)
+                
+                if sheet is None:
+                    # 如果都没有找到，读取第一个工作表
+                    df = excel_file.parse(0)
+                    self.logger.info(f"使用默认工作表读取报告数据，共 {len(df)} 行")
+                else:
+                    df = excel_file.parse(sheet)
                     self.logger.info(f"成功读取报告数据，工作表: {sheet}，共 {len(df)} 行")
-                    return df
-                except ValueError:
-                    continue
             
-            # 如果所有尝试都失败，读取第一个工作表
-            df = pd.read_excel(report_file)
-            self.logger.info(f"使用默认工作表读取报告数据，共 {len(df)} 行")
             return df
             
         except Exception as e:
@@ -84,67 +105,59 @@ class BugAnalyzer(ExcelProcessor):
         Returns:
             pd.DataFrame: 按日期统计的结果
         """
-        if df.empty:
+        if len(df.index) == 0:
             self.logger.warning("没有数据可以分析")
             return pd.DataFrame()
         
         try:
             # 确保有日期列
-            date_column = None
-            for col in df.columns:
-                if any(keyword in str(col).lower() for keyword in ['日期', 'date', '时间']):
-                    date_column = col
-                    break
+            column_info = self._col_info(df)
+            date_column = column_info['date_column']
             
             if date_column is None:
                 self.logger.error("数据中没有找到日期相关列")
                 return pd.DataFrame()
             
-            # 清理数据
-            df_clean = df.dropna(subset=[date_column])
-            
-            # 按日期分组统计
-            result = df_clean.groupby(date_column).agg({
-                date_column: 'count'  # 统计每个日期的记录数
-            }).rename(columns={date_column: '总数'})
-            
-            # 检测类型和修复状态列
-            column_info = DataUtils.detect_bug_columns(df_clean)
             type_column = column_info.get('type_column')
             status_column = column_info.get('status_column')
             
+            # 清理数据：按日期非空的掩码筛选，只取分析用到的列，不复制其余列
+            needed_columns = [col for col in (date_column, type_column, status_column) if col is not None]
+            df_clean = df.loc[df[date_column].notna().to_numpy(), list(dict.fromkeys(needed_columns))]
+            
+            # 日期编码后按编码计数，各类标记只需把对应行的编码交给np.bincount，一次遍历得到一列计数
+            codes, dates = pd.factorize(df_clean[date_column], sort=True)
+            n_dates = len(dates)
+            counts = {'总数': np.bincount(codes, minlength=n_dates)}
             if type_column and status_column:
-                # 统计程序Bug数量
-                program_bugs = df_clean[df_clean[type_column] == '程序Bug'].groupby(date_column).size()
-                result['程序Bug数'] = result.index.map(program_bugs).fillna(0).astype(int)
-                
-                # 统计程序Bug修复数量
-                program_bugs_fixed = df_clean[
-                    (df_clean[type_column] == '程序Bug') & 
-                    (df_clean[status_column] == '已修复')
-                ].groupby(date_column).size()
-                result['程序Bug修复数'] = result.index.map(program_bugs_fixed).fillna(0).astype(int)
-                
-                # 统计非程序Bug数量
-                non_program_bugs = df_clean[df_clean[type_column] == '非程序Bug'].groupby(date_column).size()
-                result['非程序Bug数'] = result.index.map(non_program_bugs).fillna(0).astype(int)
-                
-                # 统计非程序Bug修复数量
-                non_program_bugs_fixed = df_clean[
-                    (df_clean[type_column] == '非程序Bug') & 
-                    (df_clean[status_column] == '已修复')
-                ].groupby(date_column).size()
-                result['非程序Bug修复数'] = result.index.map(non_program_bugs_fixed).fillna(0).astype(int)
-            else:
+                # 转为category后多次比较都只比较整数编码
+                types = DataUtils.as_category(df_clean[type_column])
+                fixed = (DataUtils.as_category(df_clean[status_column]) == '已修复').to_numpy()
+                prog = (types == '程序Bug').to_numpy()
+                nonprog = (types == '非程序Bug').to_numpy()
+                counts['程序Bug数'] = np.bincount(codes[prog], minlength=n_dates)
+                counts['程序Bug修复数'] = np.bincount(codes[prog & fixed], minlength=n_dates)
+                counts['非程序Bug数'] = np.bincount(codes[nonprog], minlength=n_dates)
+                counts['非程序Bug修复数'] = np.bincount(codes[nonprog & fixed], minlength=n_dates)
+            
+            result = pd.DataFrame(counts, index=pd.Index(dates, name=date_column))
+            
+            if len(counts) == 1:
                 # 如果没有类型和修复状态列，则填充0
                 result['程序Bug数'] = 0
                 result['程序Bug修复数'] = 0
                 result['非程序Bug数'] = 0
                 result['非程序Bug修复数'] = 0
             
-            # 计算修复率
-            result['程序Bug修复率'] = (result['程序Bug修复数'] / result['程序Bug数'] * 100).fillna(0).round(2)
-            result['非程序Bug修复率'] = (result['非程序Bug修复数'] / result['非程序Bug数'] * 100).fillna(0).round(2)
+            # 计算修复率，数量为0的日期修复率记为0
+            for prefix in ('程序Bug', '非程序Bug'):
+                fixed_counts = result[f'{prefix}修复数'].to_numpy(dtype=float)
+                totals = result[f'{prefix}数'].to_numpy(dtype=float)
+                rates = np.divide(fixed_counts, totals, out=np.zeros_like(totals), where=totals > 0)
+                # 乘100和保留两位小数都在同一数组上原地完成
+                rates *= 100.0
+                np.round(rates, 2, out=rates)
+                result[f'{prefix}修复率'] = rates
             
             # 重置索引，使日期成为一列
             result = result.reset_index()
@@ -166,35 +179,49 @@ class BugAnalyzer(ExcelProcessor):
         Returns:
             pd.DataFrame: 按类型统计的结果
         """
-        if df.empty:
+        if len(df.index) == 0:
             self.logger.warning("没有数据可以分析")
             return pd.DataFrame()
         
         try:
             # 检测类型列
-            column_info = DataUtils.detect_bug_columns(df)
+            column_info = self._col_info(df)
             type_column = column_info.get('type_column')
             
             if type_column is None:
                 self.logger.warning("数据中没有找到类型列，使用默认分类")
-                df = df.copy()
+                # 浅复制只复制列索引，添加默认列不会修改调用方的数据
+                df = df.copy(deep=False)
                 df['类型'] = '非程序Bug'
                 type_column = '类型'
             
-            # 清理数据
-            df_clean = df.dropna(subset=[type_column])
+            status_column = column_info.get('status_column')
+            
+            # 清理数据：按类型非空的掩码筛选，只取分析用到的列，不复制其余列
+            needed_columns = [col for col in (type_column, status_column) if col is not None]
+            df_clean = df.loc[df[type_column].notna().to_numpy(), list(dict.fromkeys(needed_columns))]
             
-            # 按类型分组统计
-            result = df_clean.groupby(type_column).agg({
-                type_column: 'count'  # 统计每个类型的记录数
-            }).rename(columns={type_column: '总数'})
+            # 类型列转为category，分组按整数编码进行；修复数与总数在同一次分组中求和
+            types = DataUtils.as_category(df_clean[type_column])
+            indicators = {'总数': np.ones(len(df_clean), dtype=np.int8)}
             
             # 如果有修复状态列，添加修复统计
-            status_column = column_info.get('status_column')
             if status_column:
-                fixed_count = df_clean[df_clean[status_column] == '已修复'].groupby(type_column).size()
-                result['已修复数'] = result.index.map(fixed_count).fillna(0).astype(int)
-                result['修复率'] = (result['已修复数'] / result['总数'] * 100).round(2)
+                fixed = DataUtils.as_category(df_clean[status_column]) == '已修复'
+                indicators['已修复数'] = fixed.to_numpy().astype(np.int8)
+            
+            result = pd.DataFrame(indicators, index=df_clean.index).groupby(types, observed=True).sum()
+            # 按category分组时结果按类别顺序排列，已有的类别顺序不一定是字典序；
+            # 转回原始值后按值排序，与对原列分组的排序结果一致
+            result.index = pd.Index(np.asarray(result.index), name=type_column)
+            result = result.sort_index()
+            
+            if status_column:
+                # 每个类型至少有一条记录，总数不为0
+                rates = result['已修复数'].to_numpy(dtype=float) / result['总数'].to_numpy()
+                rates *= 100.0
+                np.round(rates, 2, out=rates)
+                result['修复率'] = rates
             else:
                 result['已修复数'] = 0
                 result['修复率'] = 0.0
@@ -225,8 +252,9 @@ class BugAnalyzer(ExcelProcessor):
                 self.logger.error("没有数据可以生成Bug分析报告")
                 return
             
-            # 生成报告文件名
-            report_filename = FileUtils.generate_timestamp_filename("Bug级别分析报告")
+            # 生成报告文件名，文件名和汇总中的生成时间使用同一时刻
+            now = datetime.now()
+            report_filename = FileUtils.generate_timestamp_filename("Bug级别分析报告", now=now)
             report_path = self.output_folder / report_filename
             
             # 准备工作表数据
@@ -255,16 +283,15 @@ class BugAnalyzer(ExcelProcessor):
                 ],
                 '数值': [
                     len(df),
-                    len(date_analysis) if not date_analysis.empty else 0,
-                    len(type_analysis) if not type_analysis.empty else 0,
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    len(date_analysis),
+                    len(type_analysis),
+                    now.strftime('%Y-%m-%d %H:%M:%S')
                 ]
             }
             summary_df = pd.DataFrame(summary_data)
             sheets_data['分析汇总'] = summary_df
             
             # 保存报告
-            from utils import ExcelUtils
             success = ExcelUtils.save_excel_with_sheets(str(report_path), sheets_data)
             
             if success:
@@ -286,7 +313,22 @@ class BugAnalyzer(ExcelProcessor):
             str: 提取的日期和姓名，格式为"0804_胡先美"，如果提取失败返回None
         """
         result = TextUtils.extract_date_and_tester(filename)
-        self.logger.debug(f"文件名 '{filename}' 提取结果: {result}")
+        # 逐行调用时日志通常关闭，使用惰性格式化避免每次都拼接字符串
+        self.logger.debug("文件名 '%s' 提取结果: %s", filename, result)
+        return result
+    
+    def extract_date_and_tester_series(self, filenames):
+        """
+        批量从文件名列中提取日期和测试人信息，每个不同的文件名只解析一次
+        
+        Args:
+            filenames (pd.Series): 文件名列
+            
+        Returns:
+            pd.Series: 格式为"月日_姓名"的字符串
+        """
+        result = TextUtils.extract_date_and_tester_series(filenames)
+        self.logger.debug(f"批量提取文件名称完成，共 {len(result)} 行")
         return result
     
     def process(self):
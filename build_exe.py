@@ -36,10 +36,24 @@ def build_exe():
         '--hidden-import=tkinter',
         '--hidden-import=xlrd',
         '--hidden-import=xlsxwriter',
+        '--exclude-module=test',        # 排除用不到的标准库测试和文档模块，减小exe体积
+        '--exclude-module=tkinter.test',
+        '--exclude-module=pydoc_data',
+        '--exclude-module=xmlrpc',
         '--clean',                      # 清理临时文件
         'main.py'                       # 主程序文件
     ]
     
+    # PyInstaller 6.0起支持字节码优化：去掉assert和文档字符串，pyc更小、加载更快
+    import PyInstaller
+    if int(PyInstaller.__version__.split('.')[0]) >= 6:
+        cmd.insert(1, '--optimize=2')
+    
+    # 项目目录下有upx文件夹时用UPX压缩，exe体积约减半，单文件模式下启动解压会稍慢；
+    # vcruntime140.dll压缩后容易被杀毒软件误报或无法加载，不压缩
+    if Path('upx').is_dir():
+        cmd[-1:-1] = ['--upx-dir=upx', '--upx-exclude=vcruntime140.dll']
+    
     # 如果没有图标文件，移除图标参数
     if not Path('icon.ico').exists():
         cmd.remove('--icon=icon.ico')
@@ -49,8 +63,8 @@ def build_exe():
         cmd.remove('--add-data=config;config')
     
     try:
-        # 执行打包命令
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        # 执行打包命令；PyInstaller的输出直接显示在控制台，而不是整体缓存到内存再解码
+        subprocess.run(cmd, check=True)
         print("打包成功！")
         print(f"exe文件位置: {project_dir}/dist/{exe_name}.exe")
         
@@ -62,7 +76,7 @@ def build_exe():
         
     except subprocess.CalledProcessError as e:
         print(f"打包失败: {e}")
-        print(f"错误输出: {e.stderr}")
+        print("错误信息请查看上方PyInstaller的输出")
         return False
     
     return exe_name
@@ -73,8 +87,10 @@ def clean_build_files():
     
     dirs_to_remove = ['build', '__pycache__']
     
-    # 动态查找所有带时间戳的spec文件
-    spec_files = list(Path('.').glob('BatchXlsxTool_*.spec'))
+    # 动态查找所有带时间戳的spec文件，前后缀固定，直接比较文件名
+    with os.scandir('.') as entries:
+        spec_files = [entry.path for entry in entries
+                      if entry.is_file() and entry.name.startswith('BatchXlsxTool_') and entry.name.endswith('.spec')]
     
     for dir_name in dirs_to_remove:
         if Path(dir_name).exists():
@@ -82,9 +98,8 @@ def clean_build_files():
             print(f"已删除: {dir_name}")
     
     for spec_file in spec_files:
-        if spec_file.exists():
-            spec_file.unlink()
-            print(f"已删除: {spec_file.name}")
+        os.unlink(spec_file)
+        print(f"已删除: {os.path.basename(spec_file)}")
 
 if __name__ == "__main__":
     print("=" * 50)
@@ -2,8 +2,10 @@
 统一的配置管理模块
 """
 import os
+import re
+import copy
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 class ConfigManager:
     """配置管理类，统一管理所有配置项"""
@@ -14,7 +16,8 @@ class ConfigManager:
         'folders': {
             'output': 'output',
             'temp': 'temp_input',
-            'logs': 'logs'
+            'logs': 'logs',
+            'cache': 'output/.cache'
         },
         
         # 文件格式配置
@@ -25,10 +28,12 @@ class ConfigManager:
         
         # Excel处理配置
         'excel': {
-            'engine': 'openpyxl',
+            'engine': 'xlsxwriter',
+            'constant_memory': True,  # xlsxwriter逐行写入，降低大文件的内存占用
             'index': False,
             'preview_rows': 100,
-            'max_file_size_mb': 100
+            'max_file_size_mb': 100,
+            'max_workers': None  # 并行读取的进程数，None表示使用CPU核心数
         },
         
         # 报告配置
@@ -36,7 +41,10 @@ class ConfigManager:
             'include_source_column': True,
             'include_timestamp': True,
             'generate_charts': False,
-            'auto_open_report': True
+            'auto_open_report': True,
+            # 批量处理的完整合并数据格式：xlsx、csv 或 parquet（需要安装pyarrow），
+            # 数据量很大时csv/parquet的写入速度远快于xlsx
+            'detail_format': 'xlsx'
         },
         
         # Bug分析配置
@@ -53,6 +61,11 @@ class ConfigManager:
             'source_columns': ['来源', 'source', '文件', 'file', '文件来源']
         },
         
+        # 缓存配置
+        'cache': {
+            'enabled': True  # 缓存清理后的输入数据，输入文件未修改时跳过重新解析
+        },
+        
         # 数据清理配置
         'data_cleaning': {
             'remove_unnamed_columns': True,
@@ -78,17 +91,52 @@ class ConfigManager:
         }
     }
     
+    # 设置该环境变量时禁用缓存；使用环境变量以便进程池中的子进程也能读取
+    NO_CACHE_ENV = 'BATCHXLSX_NO_CACHE'
+    
     def __init__(self):
         """初始化配置管理器"""
-        self._config = self.DEFAULT_CONFIG.copy()
+        # 深复制，set()修改嵌套配置时不影响类级别的默认配置
+        self._config = copy.deepcopy(self.DEFAULT_CONFIG)
+        self._flat = dict(self._flatten(self._config))
+        self._unnamed_pattern = self._build_unnamed_pattern()
+        self._supported_exts = frozenset(self.get_supported_formats())
+        # 已确认存在的文件夹路径，避免每次获取路径都调用mkdir
+        self._folder_cache = {}
+        if os.environ.get(self.NO_CACHE_ENV):
+            self.set('cache.enabled', False)
         self._ensure_directories()
     
+    @staticmethod
+    def _flatten(config_dict: Dict[str, Any], prefix: str = ''):
+        """
+        展开嵌套配置，生成 (点号分隔的键路径, 配置值) 对，子字典本身也作为一项
+        
+        Args:
+            config_dict (Dict[str, Any]): 配置字典
+            prefix (str): 键路径前缀
+        """
+        for key, value in config_dict.items():
+            key_path = f"{prefix}{key}"
+            yield key_path, value
+            if isinstance(value, dict):
+                yield from ConfigManager._flatten(value, f"{key_path}.")
+    
+    def _build_unnamed_pattern(self) -> Optional['re.Pattern']:
+        """根据配置生成匹配无用列名的正则，列名包含任一配置的文本即匹配；没有配置时返回None"""
+        patterns = self.get('data_cleaning.unnamed_column_patterns', ['Unnamed:', 'unnamed:'])
+        if not patterns:
+            return None
+        return re.compile('|'.join(re.escape(str(pattern)) for pattern in patterns))
+    
     def _ensure_directories(self):
         """确保必要的目录存在"""
         for folder_key, folder_path in self._config['folders'].items():
             # 跳过input目录，因为它通过界面选择
             if folder_key != 'input':
-                Path(folder_path).mkdir(exist_ok=True)
+                path = Path(folder_path)
+                path.mkdir(exist_ok=True)
+                self._folder_cache[folder_key] = path
     
     def get(self, key_path: str, default=None) -> Any:
         """
@@ -101,15 +149,8 @@ class ConfigManager:
         Returns:
             Any: 配置值
         """
-        keys = key_path.split('.')
-        value = self._config
-        
-        try:
-            for key in keys:
-                value = value[key]
-            return value
-        except (KeyError, TypeError):
-            return default
+        # 按展开后的键路径直接查找，不必每次拆分路径逐层访问
+        return self._flat.get(key_path, default)
     
     def set(self, key_path: str, value: Any):
         """
@@ -130,6 +171,12 @@ class ConfigManager:
         
         # 设置最终值
         config[keys[-1]] = value
+        
+        # 设置不频繁，直接重建展开后的键路径；文件夹配置可能变化，清空已确认的路径
+        self._flat = dict(self._flatten(self._config))
+        self._unnamed_pattern = self._build_unnamed_pattern()
+        self._supported_exts = frozenset(self.get_supported_formats())
+        self._folder_cache.clear()
     
     def get_folder_path(self, folder_name: str) -> Path:
         """
@@ -141,11 +188,14 @@ class ConfigManager:
         Returns:
             Path: 文件夹路径对象
         """
-        folder_path = self.get(f'folders.{folder_name}', folder_name)
-        path = Path(folder_path)
-        # 不为input目录自动创建文件夹
-        if folder_name != 'input':
-            path.mkdir(exist_ok=True)
+        path = self._folder_cache.get(folder_name)
+        if path is None:
+            folder_path = self.get(f'folders.{folder_name}', folder_name)
+            path = Path(folder_path)
+            # 不为input目录自动创建文件夹
+            if folder_name != 'input':
+                path.mkdir(exist_ok=True)
+            self._folder_cache[folder_name] = path
         return path
     
     def get_supported_formats(self) -> List[str]:
@@ -181,6 +231,14 @@ class ConfigManager:
         """获取数据清理配置"""
         return self.get_config('data_cleaning')
     
+    def get_unnamed_column_pattern(self) -> Optional['re.Pattern']:
+        """获取匹配无用列名的正则（按子串匹配），没有配置时为None"""
+        return self._unnamed_pattern
+    
+    def get_cache_config(self) -> Dict[str, Any]:
+        """获取缓存配置"""
+        return self.get_config('cache')
+    
     def get_logging_config(self) -> Dict[str, Any]:
         """获取日志配置"""
         return self.get_config('logging')
@@ -199,8 +257,8 @@ class ConfigManager:
         Returns:
             bool: 是否支持
         """
-        file_ext = Path(file_path).suffix.lower()
-        return file_ext in self.get_supported_formats()
+        # 直接按字符串取扩展名，避免每次构造Path对象
+        return os.path.splitext(file_path)[1].lower() in self._supported_exts
     
     def get_level_mapping(self) -> Dict[str, str]:
         """获取Bug级别映射"""
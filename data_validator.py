@@ -2,12 +2,12 @@
 数据验证类，用于检查数据完整性和一致性
 """
 import pandas as pd
-import os
 from pathlib import Path
+from openpyxl import load_workbook
 
 from config_manager import config
 from logger_config import LoggerConfig
-from utils import FileUtils
+from utils import FileUtils, DataUtils, ExcelUtils
 
 class DataValidator:
     """数据验证类，用于检查数据完整性和一致性"""
@@ -22,17 +22,18 @@ class DataValidator:
         self.output_folder = config.get_folder_path('output') if output_folder is None else Path(output_folder)
         self.logger = LoggerConfig.get_logger(self.__class__.__name__)
     
-    def find_latest_report(self, prefix="详细分析报告"):
+    def find_latest_report(self, prefix="详细分析报告", extension='xlsx'):
         """
         查找最新的报告文件
         
         Args:
             prefix (str): 文件名前缀
+            extension (str): 文件扩展名，默认为xlsx；本类的检查方法都按Excel读取报告
             
         Returns:
             Path: 最新报告文件的路径
         """
-        pattern = f"{prefix}*.xlsx"
+        pattern = f"{prefix}*.{extension}"
         latest_file = FileUtils.find_latest_file(str(self.output_folder), pattern)
         
         if latest_file:
@@ -42,7 +43,25 @@ class DataValidator:
         
         return latest_file
     
-    def check_data_integrity(self, original_file, merged_file, filter_column, filter_value):
+    @staticmethod
+    def _filter_mask(series, filter_value, match_mode='substring'):
+        """
+        生成过滤掩码
+        
+        Args:
+            series (pd.Series): 过滤列
+            filter_value (str): 过滤值
+            match_mode (str): 'substring' 按普通子串匹配，'equals' 完全相等，'regex' 按正则表达式匹配
+            
+        Returns:
+            np.ndarray: 布尔掩码，缺失值不匹配
+        """
+        if match_mode == 'equals':
+            return series.to_numpy() == filter_value
+        # 子串匹配不经过正则引擎
+        return series.str.contains(filter_value, na=False, regex=(match_mode == 'regex')).to_numpy(dtype=bool)
+    
+    def check_data_integrity(self, original_file, merged_file, filter_column, filter_value, match_mode='substring'):
         """
         检查数据完整性
         
@@ -51,6 +70,7 @@ class DataValidator:
             merged_file (str): 合并文件路径
             filter_column (str): 过滤列名
             filter_value (str): 过滤值
+            match_mode (str): 过滤方式，'substring'、'equals' 或 'regex'
             
         Returns:
             bool: 数据是否完整
@@ -60,18 +80,20 @@ class DataValidator:
             
             # 1. 检查原始文件
             self.logger.info(f"检查原始文件: {original_file}")
-            df_original = pd.read_excel(original_file)
-            self.logger.info(f"原始文件行数: {len(df_original)}")
+            # 只需要行数，流式计数，不把数据读取为DataFrame
+            original_rows = ExcelUtils.count_data_rows(original_file)
+            self.logger.info(f"原始文件行数: {original_rows}")
             
             # 2. 检查合并文件
             self.logger.info(f"检查合并文件: {merged_file}")
-            df_merged = pd.read_excel(merged_file)
-            df_filtered = df_merged[df_merged[filter_column].str.contains(filter_value, na=False)]
+            # 只需要过滤列，其他列不生成DataFrame
+            df_merged = ExcelUtils.read_excel(merged_file, usecols=[filter_column])
+            df_filtered = df_merged[self._filter_mask(df_merged[filter_column], filter_value, match_mode)]
             self.logger.info(f"合并文件中过滤后行数: {len(df_filtered)}")
             
             # 3. 对比分析
-            difference = len(df_original) - len(df_filtered)
-            self.logger.info(f"数据对比 - 原始: {len(df_original)}行, 合并过滤后: {len(df_filtered)}行, 差异: {difference}行")
+            difference = original_rows - len(df_filtered)
+            self.logger.info(f"数据对比 - 原始: {original_rows}行, 合并过滤后: {len(df_filtered)}行, 差异: {difference}行")
             
             if difference != 0:
                 self.logger.warning("数据有丢失!")
@@ -84,7 +106,7 @@ class DataValidator:
             self.logger.error(f"检查数据完整性时出错: {e}")
             return False
     
-    def analyze_missing_data(self, merged_file, filter_column, filter_value):
+    def analyze_missing_data(self, merged_file, filter_column, filter_value, match_mode='substring'):
         """
         分析丢失数据的原因
         
@@ -92,6 +114,7 @@ class DataValidator:
             merged_file (str): 合并文件路径
             filter_column (str): 过滤列名
             filter_value (str): 过滤值
+            match_mode (str): 过滤方式，'substring'、'equals' 或 'regex'
             
         Returns:
             dict: 分析结果
@@ -99,41 +122,40 @@ class DataValidator:
         try:
             self.logger.info(f"开始分析{filter_value}数据丢失原因")
             
-            # 读取合并文件
-            df = pd.read_excel(merged_file)
+            with pd.ExcelFile(merged_file) as excel_file:
+                # 先只读表头确定级别列，再只读取分析用到的列
+                header = excel_file.parse(nrows=0).columns
+                
+                level_column = DataUtils.find_column(tuple(header), tuple(config.get_level_columns()))
+                
+                check_columns = ['编号', level_column, 'bug类型', '功能模块']
+                needed_columns = [filter_column] + [col for col in check_columns if col in header]
+                df = excel_file.parse(usecols=list(dict.fromkeys(needed_columns)))
             
             # 筛选数据
-            df_filtered = df[df[filter_column].str.contains(filter_value, na=False)]
+            df_filtered = df[self._filter_mask(df[filter_column], filter_value, match_mode)]
             self.logger.info(f"合并文件中{filter_value}数据总行数: {len(df_filtered)}")
             
-            # 统计级别分布
-            level_columns = config.get_level_columns()
-            level_column = None
-            
-            for col in df.columns:
-                if any(keyword in col.lower() for keyword in level_columns):
-                    level_column = col
-                    break
-            
             analysis_result = {
                 'total_rows': len(df_filtered),
                 'level_distribution': {},
                 'null_counts': {}
             }
             
+            # 统计级别分布
             if level_column:
-                level_counts = df_filtered[level_column].value_counts(dropna=False)
+                # 级别只有少数几种取值，转为category后按整数编码计数
+                level_counts = DataUtils.as_category(df_filtered[level_column]).value_counts(dropna=False)
+                level_counts = level_counts[level_counts > 0]
                 analysis_result['level_distribution'] = level_counts.to_dict()
                 self.logger.info(f"{filter_value}数据级别分布: {analysis_result['level_distribution']}")
             
-                # 检查空值情况
-                check_columns = ['编号', level_column, 'bug类型', '功能模块']
-                for col in check_columns:
-                    if col in df_filtered.columns:
-                        null_count = df_filtered[col].isnull().sum()
-                        analysis_result['null_counts'][col] = null_count
-                        if null_count > 0:
-                            self.logger.warning(f"{col}列有{null_count}个空值")
+                # 检查空值情况：对所有检查列一次性按列统计
+                present_columns = [col for col in dict.fromkeys(check_columns) if col in df_filtered.columns]
+                null_counts = df_filtered[present_columns].isna().sum()
+                analysis_result['null_counts'] = null_counts.to_dict()
+                for col, null_count in null_counts[null_counts > 0].items():
+                    self.logger.warning(f"{col}列有{null_count}个空值")
             else:
                 self.logger.warning("未找到级别相关列")
             
@@ -156,35 +178,43 @@ class DataValidator:
         try:
             self.logger.info(f"验证报告结构: {Path(report_file).name}")
             
-            # 读取所有工作表
-            excel_file = pd.ExcelFile(report_file)
-            sheets = excel_file.sheet_names
-            
-            result = {
-                'valid': True,
-                'sheet_count': len(sheets),
-                'sheet_names': sheets,
-                'issues': []
-            }
-            
-            # 检查必需的工作表
-            required_sheets = ['详细数据', '分析统计']
-            for sheet in required_sheets:
-                if sheet not in sheets:
-                    result['valid'] = False
-                    result['issues'].append(f"缺少必需工作表: {sheet}")
-            
-            # 检查每个工作表的数据
-            for sheet_name in sheets:
-                try:
-                    df = pd.read_excel(report_file, sheet_name=sheet_name)
-                    if df.empty:
-                        result['issues'].append(f"工作表 '{sheet_name}' 为空")
-                    else:
-                        self.logger.info(f"工作表 '{sheet_name}': {len(df)} 行 {len(df.columns)} 列")
-                except Exception as e:
-                    result['valid'] = False
-                    result['issues'].append(f"读取工作表 '{sheet_name}' 失败: {e}")
+            # 只读模式打开一次工作簿；检查只需要各工作表的行列数，不把数据解析为DataFrame
+            workbook = load_workbook(report_file, read_only=True, data_only=True)
+            try:
+                sheets = workbook.sheetnames
+                
+                result = {
+                    'valid': True,
+                    'sheet_count': len(sheets),
+                    'sheet_names': sheets,
+                    'issues': []
+                }
+                
+                # 检查必需的工作表
+                required_sheets = ['详细数据', '分析统计']
+                for sheet in required_sheets:
+                    if sheet not in sheets:
+                        result['valid'] = False
+                        result['issues'].append(f"缺少必需工作表: {sheet}")
+                
+                # 检查每个工作表的数据
+                for sheet_name in sheets:
+                    try:
+                        worksheet = workbook[sheet_name]
+                        if worksheet.max_row is None or worksheet.max_column is None:
+                            # 文件中没有记录工作表尺寸时逐行统计
+                            worksheet.calculate_dimension(force=True)
+                        # 第一行为表头
+                        data_rows = max((worksheet.max_row or 0) - 1, 0)
+                        if data_rows == 0 or not worksheet.max_column:
+                            result['issues'].append(f"工作表 '{sheet_name}' 为空")
+                        else:
+                            self.logger.info(f"工作表 '{sheet_name}': {data_rows} 行 {worksheet.max_column} 列")
+                    except Exception as e:
+                        result['valid'] = False
+                        result['issues'].append(f"读取工作表 '{sheet_name}' 失败: {e}")
+            finally:
+                workbook.close()
             
             if result['valid']:
                 self.logger.info("报告结构验证通过")
@@ -1,17 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import numpy as np
 import pandas as pd
 import os
+import sys
 import logging
 from pathlib import Path
 import shutil
 from datetime import datetime
 import threading
+import multiprocessing
 
 from batch_processor import BatchProcessor
 from single_processor import SingleProcessor
 from data_validator import DataValidator
 from bug_analyzer import BugAnalyzer
+from utils import FileUtils, DataUtils, ExcelUtils
+from config_manager import config
 
 
 class ExcelAnalysisGUI:
@@ -327,7 +332,8 @@ class ExcelAnalysisGUI:
             
             # 查找最新的详细分析报告并自动打开
             validator = DataValidator()
-            latest_file = validator.find_latest_report("详细分析报告")
+            # 详细分析报告按配置的格式保存，按实际保存的扩展名查找
+            latest_file = validator.find_latest_report("详细分析报告", extension=FileUtils.get_detail_format())
             
             if latest_file:
                 # 在主线程中打开详细分析报告
@@ -345,13 +351,13 @@ class ExcelAnalysisGUI:
     def analyze_bug_levels_for_gui(self, excel_file_path):
         """为GUI优化的Bug级别分析"""
         try:
-            df = pd.read_excel(excel_file_path)
+            df = ExcelUtils.read_excel(excel_file_path)
             
             self.log_message(f"读取到 {len(df)} 行数据")
             
             # 检查来源文件列和级别相关的列
-            source_columns = [col for col in df.columns if any(keyword in col.lower() for keyword in ['来源', 'source', '文件', 'file'])]
-            level_columns = [col for col in df.columns if any(keyword in col.lower() for keyword in ['级别', 'level', '等级', 'priority', '严重', 'severity'])]
+            source_columns = DataUtils.match_columns(df.columns, tuple(config.get_source_columns()))
+            level_columns = DataUtils.match_columns(df.columns, tuple(config.get_level_columns()))
             
             self.log_message(f"检测到来源列: {source_columns}")
             self.log_message(f"检测到级别列: {level_columns}")
@@ -365,15 +371,15 @@ class ExcelAnalysisGUI:
             
             # 数据预处理 - 只删除来源列为空的行
             self.log_message(f"数据预处理前行数: {len(df)}")
-            df_clean = df.dropna(subset=[source_col]).copy()
+            # 按来源列非空的掩码筛选，只取统计用到的列，不复制其余列；
+            # 浅复制只是为了解除与df的关联，后续添加和替换列不会触发链式赋值警告
+            needed_columns = [source_col, level_col] + [col for col in ('类型', '修复状态') if col in df.columns]
+            df_clean = df.loc[df[source_col].notna().to_numpy(), list(dict.fromkeys(needed_columns))].copy(deep=False)
             self.log_message(f"删除来源列为空后行数: {len(df_clean)}")
             
-            # 对级别为空的数据给默认值
-            df_clean[level_col] = df_clean[level_col].fillna('未分级')
-            
             # 从来源文件名中提取日期和测试人信息
             analyzer = BugAnalyzer()
-            df_clean['文件名称'] = df_clean[source_col].apply(analyzer.extract_date_and_tester_from_filename)
+            df_clean['文件名称'] = analyzer.extract_date_and_tester_series(df_clean[source_col])
             
             # 统计文件名称提取成功的数量
             filename_extracted = df_clean['文件名称'].notna().sum()
@@ -391,58 +397,56 @@ class ExcelAnalysisGUI:
                 'C-轻微': 'C级'
             }
             
-            # 先映射，对于无法映射的值才设为'未分级'
-            df_clean['级别'] = df_clean[level_col].map(level_mapping)
-            
-            # 只有真正无法映射的值才设为'未分级'
-            unmapped_mask = df_clean['级别'].isna()
-            df_clean.loc[unmapped_mask, '级别'] = '未分级'
+            # 按原始级别做字典编码，无法映射的值（含空值）编码为'未分级'，
+            # 级别列直接成为category，编码即为透视表的列位置
+            level_names = list(level_mapping.values()) + ['未分级']
+            level_codes = pd.Categorical(df_clean[level_col], categories=list(level_mapping)).codes.astype(np.intp)
+            level_codes[level_codes < 0] = len(level_mapping)
+            df_clean['级别'] = pd.Categorical.from_codes(level_codes, categories=level_names)
             
             # 验证映射结果
-            self.log_message(f"映射后级别分布: {df_clean['级别'].value_counts().to_dict()}")
-            
-            # 统计各级别Bug数量
-            result = df_clean.groupby(['文件名称', '级别']).size().unstack(fill_value=0)
+            level_counts = df_clean['级别'].value_counts()
+            self.log_message(f"映射后级别分布: {level_counts[level_counts > 0].to_dict()}")
             
-            # 确保包含基本级别的列，但只有当数据中真的存在'未分级'时才添加该列
-            expected_levels = ['S级', 'A级', 'B级', 'C级']
-            actual_levels = df_clean['级别'].unique()
-            
-            # 只有当数据中真的存在'未分级'时才添加该列
-            if '未分级' in actual_levels:
-                expected_levels.append('未分级')
-                
-            for level in expected_levels:
-                if level not in result.columns:
-                    result[level] = 0
+            # 统计各级别Bug数量：按文件名称和级别的编码一次计数得到透视表，不生成MultiIndex再unstack
+            file_codes, file_names = pd.factorize(df_clean['文件名称'], sort=True)
+            counts = np.bincount(file_codes * len(level_names) + level_codes,
+                                 minlength=len(file_names) * len(level_names))
+            result = pd.DataFrame(counts.reshape(len(file_names), len(level_names)),
+                                  index=pd.Index(file_names, name='文件名称'),
+                                  columns=pd.Index(level_names, name='级别'))
             
-            # 重新排序列
-            level_order = ['S级', 'A级', 'B级', 'C级', '未分级']
-            available_levels = [level for level in level_order if level in result.columns]
-            other_levels = [col for col in result.columns if col not in level_order]
-            
-            result = result[available_levels + other_levels]
+            # 列顺序固定为S、A、B、C级，只有当数据中真的存在'未分级'时才保留该列
+            if level_counts['未分级'] == 0:
+                result = result.drop(columns='未分级')
             
             # 添加总计列
             result['总计'] = result.sum(axis=1)
             
             # 如果数据中包含类型和修复状态列，则添加额外的统计
             if '类型' in df_clean.columns and '修复状态' in df_clean.columns:
+                # 类型和修复状态转为category，各掩码只计算一次且按整数编码比较
+                types = DataUtils.as_category(df_clean['类型'])
+                is_program = types == '程序Bug'
+                is_non_program = types == '非程序Bug'
+                is_fixed = DataUtils.as_category(df_clean['修复状态']) == '已修复'
+                # 各项计数按结果索引reindex对齐，没有记录的文件补0，保持整数类型
+                
                 # 统计程序Bug数量
-                program_bugs = df_clean[df_clean['类型'] == '程序Bug'].groupby('文件名称').size()
-                result['程序Bug数'] = result.index.map(program_bugs).fillna(0).astype(int)
+                program_bugs = df_clean[is_program].groupby('文件名称').size()
+                result['程序Bug数'] = program_bugs.reindex(result.index, fill_value=0)
                 
                 # 统计程序Bug修复数量
-                program_bugs_fixed = df_clean[(df_clean['类型'] == '程序Bug') & (df_clean['修复状态'] == '已修复')].groupby('文件名称').size()
-                result['程序Bug修复数'] = result.index.map(program_bugs_fixed).fillna(0).astype(int)
+                program_bugs_fixed = df_clean[is_program & is_fixed].groupby('文件名称').size()
+                result['程序Bug修复数'] = program_bugs_fixed.reindex(result.index, fill_value=0)
                 
                 # 统计非程序Bug数量
-                non_program_bugs = df_clean[df_clean['类型'] == '非程序Bug'].groupby('文件名称').size()
-                result['非程序Bug数'] = result.index.map(non_program_bugs).fillna(0).astype(int)
+                non_program_bugs = df_clean[is_non_program].groupby('文件名称').size()
+                result['非程序Bug数'] = non_program_bugs.reindex(result.index, fill_value=0)
                 
                 # 统计非程序Bug修复数量
-                non_program_bugs_fixed = df_clean[(df_clean['类型'] == '非程序Bug') & (df_clean['修复状态'] == '已修复')].groupby('文件名称').size()
-                result['非程序Bug修复数'] = result.index.map(non_program_bugs_fixed).fillna(0).astype(int)
+                non_program_bugs_fixed = df_clean[is_non_program & is_fixed].groupby('文件名称').size()
+                result['非程序Bug修复数'] = non_program_bugs_fixed.reindex(result.index, fill_value=0)
             else:
                 # 如果没有类型和修复状态列，则填充0
                 result['程序Bug数'] = 0
@@ -465,56 +469,23 @@ class ExcelAnalysisGUI:
         # 清空现有数据
         self.clear_bug_stats()
         
+        # 按表格列顺序取出数据，缺少的列补0：总计, 程序Bug数, 程序Bug修复数, 非程序Bug数, 非程序Bug修复数, S级, A级, B级, C级, 未分级
+        level_columns = ['S级', 'A级', 'B级', 'C级', '未分级']
+        display_columns = ['总计', '程序Bug数', '程序Bug修复数', '非程序Bug数', '非程序Bug修复数'] + level_columns
+        table = bug_stats.reindex(columns=display_columns, fill_value=0)
+        
+        # 各列总计一次向量化求和，不再逐行累加
+        column_totals = table.sum()
+        total_bugs = column_totals['总计']
+        level_totals = column_totals[level_columns].to_dict()
+        
         # 添加数据到表格
-        total_bugs = 0
-        level_totals = {}
-        
-        for filename, row in bug_stats.iterrows():
-            # 按新的列顺序填充数据：文件名称, 总计, 程序Bug数, 程序Bug修复数, 非程序Bug数, 非程序Bug修复数, S级, A级, B级, C级, 未分级
-            values = [
-                filename,
-                str(row.get('总计', 0)),
-                str(row.get('程序Bug数', 0)),
-                str(row.get('程序Bug修复数', 0)),
-                str(row.get('非程序Bug数', 0)),
-                str(row.get('非程序Bug修复数', 0)),
-                str(row.get('S级', 0)),
-                str(row.get('A级', 0)),
-                str(row.get('B级', 0)),
-                str(row.get('C级', 0)),
-                str(row.get('未分级', 0))
-            ]
-            
-            # 统计级别总数（不包括统计列）
-            for col in ['S级', 'A级', 'B级', 'C级', '未分级']:
-                value = row.get(col, 0)
-                level_totals[col] = level_totals.get(col, 0) + value
-            
-            total_bugs += row.get('总计', 0)
-            self.bug_tree.insert('', 'end', values=values)
+        for filename, row_values in zip(table.index, table.to_numpy().tolist()):
+            self.bug_tree.insert('', 'end', values=[filename] + [str(value) for value in row_values])
         
         # 添加总计行
         if len(bug_stats) > 1:
-            # 计算程序Bug和非程序Bug的总计
-            total_program_bugs = bug_stats['程序Bug数'].sum() if '程序Bug数' in bug_stats.columns else 0
-            total_program_bugs_fixed = bug_stats['程序Bug修复数'].sum() if '程序Bug修复数' in bug_stats.columns else 0
-            total_non_program_bugs = bug_stats['非程序Bug数'].sum() if '非程序Bug数' in bug_stats.columns else 0
-            total_non_program_bugs_fixed = bug_stats['非程序Bug修复数'].sum() if '非程序Bug修复数' in bug_stats.columns else 0
-            
-            # 按新的列顺序填充总计行：文件名称, 总计, 程序Bug数, 程序Bug修复数, 非程序Bug数, 非程序Bug修复数, S级, A级, B级, C级, 未分级
-            total_row = [
-                '总计',
-                str(total_bugs),
-                str(total_program_bugs),
-                str(total_program_bugs_fixed),
-                str(total_non_program_bugs),
-                str(total_non_program_bugs_fixed),
-                str(level_totals.get('S级', 0)),
-                str(level_totals.get('A级', 0)),
-                str(level_totals.get('B级', 0)),
-                str(level_totals.get('C级', 0)),
-                str(level_totals.get('未分级', 0))
-            ]
+            total_row = ['总计'] + [str(value) for value in column_totals.tolist()]
             
             self.bug_tree.insert('', 'end', values=total_row, tags=('total',))
             self.bug_tree.tag_configure('total', background='lightgray', font=('Arial', 9, 'bold'))
@@ -533,7 +504,6 @@ class ExcelAnalysisGUI:
     def open_report_file(self, file_path):
         """打开报告文件"""
         try:
-            from utils import FileUtils
             success = FileUtils.open_file(file_path)
             if success:
                 self.log_message(f"已打开详细分析报告: {os.path.basename(file_path)}")
@@ -546,6 +516,7 @@ class ExcelAnalysisGUI:
         """开始Bug级别分析"""
         # 查找最新的详细分析报告
         validator = DataValidator()
+        # Bug级别分析按Excel读取，详细分析报告保存为csv/parquet时使用同名前缀的统一分析报告
         latest_file = validator.find_latest_report("详细分析报告")
         
         if not latest_file:
@@ -591,8 +562,9 @@ class ExcelAnalysisGUI:
             output_dir = Path("output")
             output_dir.mkdir(exist_ok=True)
             
-            # 生成报告文件名
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            # 生成报告文件名，文件名和分析时间使用同一时刻
+            now = datetime.now()
+            timestamp = now.strftime('%Y%m%d_%H%M%S')
             report_filename = f"Bug级别分析报告_{timestamp}.xlsx"
             report_path = output_dir / report_filename
             
@@ -623,10 +595,11 @@ class ExcelAnalysisGUI:
             # 重新排列DataFrame的列
             bug_stats_reordered = bug_stats_reset[column_order]
             
-            # 创建Excel写入器
-            with pd.ExcelWriter(report_path, engine='openpyxl') as writer:
+            # 创建Excel写入器，xlsxwriter按行写入磁盘
+            with pd.ExcelWriter(report_path, engine='xlsxwriter',
+                                **ExcelUtils.get_writer_kwargs('xlsxwriter')) as writer:
                 # 写入Bug统计数据
-                bug_stats_reordered.to_excel(writer, sheet_name='Bug级别统计', index=False)
+                ExcelUtils.write_sheet(writer, 'Bug级别统计', bug_stats_reordered)
                 
                 # 获取工作表对象进行格式化
                 worksheet = writer.sheets['Bug级别统计']
@@ -647,42 +620,22 @@ class ExcelAnalysisGUI:
                 }
                 
                 for col, width in column_widths.items():
-                    worksheet.column_dimensions[col].width = width
+                    worksheet.set_column(f'{col}:{col}', width)
                 
-                # 添加总计行（如果有多个文件）
+                # 添加总计行（如果有多个文件），紧接在数据行之后按顺序写入
                 if len(bug_stats_reordered) > 1:
-                    total_row = len(bug_stats_reordered) + 2  # +2 因为有标题行和从1开始计数
+                    total_row = len(bug_stats_reordered) + 1  # 从0开始计数，标题行占第0行
                     
-                    # 计算各列总计
-                    worksheet[f'A{total_row}'] = '总计'
-                    worksheet[f'B{total_row}'] = bug_stats['总计'].sum()
-                    worksheet[f'C{total_row}'] = bug_stats['程序Bug数'].sum() if '程序Bug数' in bug_stats.columns else 0
-                    worksheet[f'D{total_row}'] = bug_stats['程序Bug修复数'].sum() if '程序Bug修复数' in bug_stats.columns else 0
-                    worksheet[f'E{total_row}'] = bug_stats['非程序Bug数'].sum() if '非程序Bug数' in bug_stats.columns else 0
-                    worksheet[f'F{total_row}'] = bug_stats['非程序Bug修复数'].sum() if '非程序Bug修复数' in bug_stats.columns else 0
-                    
-                    # 计算各级别总计 - 动态根据实际列位置写入
-                    level_start_col = 7  # S级开始的列位置（G列）
-                    for level in ['S级', 'A级', 'B级', 'C级', '未分级']:
-                        if level in bug_stats_reordered.columns:
-                            col_idx = bug_stats_reordered.columns.get_loc(level)
-                            col_letter = chr(ord('A') + col_idx)
-                            worksheet[f'{col_letter}{total_row}'] = bug_stats[level].sum() if level in bug_stats.columns else 0
+                    # 计算各列总计，所有列一次求和
+                    total_values = ['总计'] + [int(value) for value in bug_stats_reordered.iloc[:, 1:].sum().tolist()]
                     
                     # 设置总计行样式
-                    from openpyxl.styles import Font, PatternFill
-                    bold_font = Font(bold=True)
-                    gray_fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
-                    
-                    for col_idx in range(len(bug_stats_reordered.columns)):
-                        col_letter = chr(ord('A') + col_idx)
-                        cell = worksheet[f'{col_letter}{total_row}']
-                        cell.font = bold_font
-                        cell.fill = gray_fill
+                    total_format = writer.book.add_format({'bold': True, 'bg_color': '#D3D3D3'})
+                    worksheet.write_row(total_row, 0, total_values, total_format)
                 
                 # 添加分析摘要工作表
                 summary_data = []
-                summary_data.append(['分析时间', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
+                summary_data.append(['分析时间', now.strftime('%Y-%m-%d %H:%M:%S')])
                 summary_data.append(['源文件', os.path.basename(source_file_path)])
                 summary_data.append(['分析文件数量', len(bug_stats)])
                 summary_data.append(['总Bug数量', bug_stats['总计'].sum()])
@@ -715,12 +668,12 @@ class ExcelAnalysisGUI:
                         summary_data.append(['非程序Bug修复率', f'{fix_rate:.1f}%'])
                 
                 summary_df = pd.DataFrame(summary_data, columns=['项目', '值'])
-                summary_df.to_excel(writer, sheet_name='分析摘要', index=False)
+                ExcelUtils.write_sheet(writer, '分析摘要', summary_df)
                 
                 # 设置摘要工作表列宽
                 summary_worksheet = writer.sheets['分析摘要']
-                summary_worksheet.column_dimensions['A'].width = 20
-                summary_worksheet.column_dimensions['B'].width = 25
+                summary_worksheet.set_column('A:A', 20)
+                summary_worksheet.set_column('B:B', 25)
             
             self.log_message(f"Bug级别分析报告已生成: {report_filename}")
             
@@ -778,4 +731,12 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    # 打包为exe后进程池需要此调用
+    multiprocessing.freeze_support()
+    
+    # --no-cache：重新解析所有输入文件，不读写缓存
+    if '--no-cache' in sys.argv[1:]:
+        os.environ[config.NO_CACHE_ENV] = '1'
+        config.set('cache.enabled', False)
+    
     main()
\ No newline at end of file
@@ -1,6 +1,7 @@
 """
 报告生成器基类，提供统一的报告生成功能
 """
+import weakref
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
@@ -15,10 +16,45 @@ class ReportGenerator:
     def __init__(self):
         self.output_folder = config.get_folder_path('output')
         self.logger = LoggerConfig.get_logger(self.__class__.__name__)
+        # 最近一个DataFrame的缺失值计数和重复行数：(DataFrame的弱引用, 统计值)，多个报告共用
+        self._frame_profile = None
         
         # 确保输出文件夹存在
         self.output_folder.mkdir(exist_ok=True)
     
+    def _seed_frame_profile(self, df, **values):
+        """
+        预先登记DataFrame已知的统计值，之后的报告不再重新扫描数据
+        
+        Args:
+            df (pd.DataFrame): 数据
+            **values: 统计值，如 missing_counts、duplicate_count、dtype_counts
+        """
+        if self._frame_profile is None or self._frame_profile[0]() is not df:
+            self._frame_profile = (weakref.ref(df), {})
+        self._frame_profile[1].update(values)
+    
+    def _get_frame_profile(self, df):
+        """
+        获取DataFrame的缺失值计数和重复行数，同一DataFrame生成多个报告时只计算一次
+        
+        Args:
+            df (pd.DataFrame): 数据
+            
+        Returns:
+            dict: 包含 missing_counts、duplicate_count 和 dtype_counts
+        """
+        if self._frame_profile is None or self._frame_profile[0]() is not df:
+            self._frame_profile = (weakref.ref(df), {})
+        profile = self._frame_profile[1]
+        if 'missing_counts' not in profile:
+            profile['missing_counts'] = DataUtils.count_nulls(df)
+        if 'duplicate_count' not in profile:
+            profile['duplicate_count'] = DataUtils.count_duplicate_rows(df)
+        if 'dtype_counts' not in profile:
+            profile['dtype_counts'] = DataUtils.dtype_counts(df)
+        return profile
+    
     def clean_data(self, df):
         """
         清理数据
@@ -80,7 +116,8 @@ class ReportGenerator:
                 stats_data.append(['=== 数据质量 ===', ''])
                 
                 # 缺失值统计
-                missing_counts = df.isnull().sum()
+                profile = self._get_frame_profile(df)
+                missing_counts = profile['missing_counts']
                 total_missing = missing_counts.sum()
                 stats_data.append(['总缺失值', total_missing])
                 
@@ -91,13 +128,16 @@ class ReportGenerator:
                     # 各列缺失值详情
                     stats_data.append(['', ''])
                     stats_data.append(['各列缺失值详情', ''])
-                    for col, missing_count in missing_counts.items():
-                        if missing_count > 0:
-                            col_missing_rate = (missing_count / len(df)) * 100
-                            stats_data.append([f'  {col}', f'{missing_count} ({col_missing_rate:.1f}%)'])
+                    # 复用上面的缺失值计数，向量化计算各列比例
+                    missing_counts = missing_counts[missing_counts > 0]
+                    missing_rates = (missing_counts / len(df) * 100).map('{:.1f}'.format)
+                    stats_data.extend(
+                        [f'  {col}', f'{count} ({rate}%)']
+                        for col, count, rate in zip(missing_counts.index, missing_counts, missing_rates)
+                    )
                 
                 # 重复值统计
-                duplicate_count = df.duplicated().sum()
+                duplicate_count = profile['duplicate_count']
                 stats_data.append(['重复行数', duplicate_count])
                 if duplicate_count > 0:
                     duplicate_rate = (duplicate_count / len(df)) * 100
@@ -106,7 +146,8 @@ class ReportGenerator:
                 # 数据类型统计
                 stats_data.append(['', ''])
                 stats_data.append(['=== 数据类型 ===', ''])
-                type_counts = df.dtypes.value_counts()
+                # 按内存优化前的类型统计，category和字符串列按其值类型计
+                type_counts = profile['dtype_counts']
                 for dtype, count in type_counts.items():
                     stats_data.append([f'{dtype} 类型列数', count])
                 
@@ -139,7 +180,7 @@ class ReportGenerator:
                 business_stats.append(['', ''])
                 business_stats.append(['=== Bug级别统计 ===', ''])
                 
-                severity_counts = df['严重级别'].value_counts()
+                severity_counts = DataUtils.value_counts_stable(df['严重级别'])
                 for severity, count in severity_counts.items():
                     percentage = (count / len(df)) * 100
                     business_stats.append([severity, f'{count} ({percentage:.1f}%)'])
@@ -148,7 +189,7 @@ class ReportGenerator:
                 business_stats.append(['', ''])
                 business_stats.append(['=== Bug类型统计 ===', ''])
                 
-                type_counts = df['bug类型'].value_counts()
+                type_counts = DataUtils.value_counts_stable(df['bug类型'])
                 for bug_type, count in type_counts.items():
                     percentage = (count / len(df)) * 100
                     business_stats.append([bug_type, f'{count} ({percentage:.1f}%)'])
@@ -157,7 +198,7 @@ class ReportGenerator:
                 business_stats.append(['', ''])
                 business_stats.append(['=== 修复状态统计 ===', ''])
                 
-                status_counts = df['修复状态'].value_counts()
+                status_counts = DataUtils.value_counts_stable(df['修复状态'])
                 for status, count in status_counts.items():
                     percentage = (count / len(df)) * 100
                     business_stats.append([status, f'{count} ({percentage:.1f}%)'])
@@ -166,15 +207,15 @@ class ReportGenerator:
                 business_stats.append(['', ''])
                 business_stats.append(['=== 功能模块统计 ===', ''])
                 
-                module_counts = df['功能模块'].value_counts()
-                # 只显示前10个最多的模块
-                top_modules = module_counts.head(10)
-                for module, count in top_modules.items():
+                # 计数相同的模块按首次出现顺序排列，前10名不受列类型影响
+                module_counts = DataUtils.value_counts_stable(df['功能模块'])
+                # 只显示前10个最多的模块，直接按位置切片遍历
+                for module, count in module_counts.iloc[:10].items():
                     percentage = (count / len(df)) * 100
                     business_stats.append([module, f'{count} ({percentage:.1f}%)'])
                 
                 if len(module_counts) > 10:
-                    other_count = module_counts.tail(len(module_counts) - 10).sum()
+                    other_count = module_counts.iloc[10:].sum()
                     other_percentage = (other_count / len(df)) * 100
                     business_stats.append(['其他模块', f'{other_count} ({other_percentage:.1f}%)'])
             
@@ -195,7 +236,8 @@ class ReportGenerator:
             Path: 生成的报告文件路径
         """
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            now = datetime.now()
+            timestamp = now.strftime('%Y%m%d_%H%M%S')
             report_filename = f"详细分析报告_{report_name_prefix}_{timestamp}.xlsx"
             report_path = self.output_folder / report_filename
             
@@ -210,7 +252,7 @@ class ReportGenerator:
                 empty_data = pd.DataFrame({
                     '数据说明': [
                         '数据处理结果',
-                        f'处理时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}',
+                        f'处理时间: {now.strftime("%Y-%m-%d %H:%M:%S")}',
                         '数据状态: 处理后数据为空',
                         '可能原因: 原始文件无有效数据或数据被过滤',
                         '建议: 请检查原始文件是否包含有效数据'
@@ -2,6 +2,7 @@
 单个文件处理器，继承自ReportGenerator
 """
 from pathlib import Path
+import pandas as pd
 
 from report_generator import ReportGenerator
 from config_manager import config
@@ -37,8 +38,8 @@ class SingleProcessor(ReportGenerator):
             
             self.logger.info(f"成功读取文件，共 {len(df)} 行数据")
             
-            # 清理数据
-            original_df = df.copy()
+            # 清理数据（clean_data返回新的DataFrame，原始数据只在清理后为空时用于说明，无需复制）
+            original_df = df
             original_rows, original_cols = df.shape
             
             df = self.clean_data(df)
@@ -80,8 +81,6 @@ class SingleProcessor(ReportGenerator):
         Returns:
             pd.DataFrame: 说明数据
         """
-        import pandas as pd
-        
         explanation_data = {
             '数据说明': [
                 '原始文件数据分析',
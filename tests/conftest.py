@@ -0,0 +1,36 @@
+"""
+测试公共配置：把项目目录加入导入路径，并在临时目录中运行，
+避免导入模块时创建的 output、logs 等文件夹写入项目目录
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+_WORK_DIR = tempfile.mkdtemp(prefix='batchxlsx_test_')
+os.chdir(_WORK_DIR)
+
+# 测试之间不共享磁盘缓存
+os.environ['BATCHXLSX_NO_CACHE'] = '1'
+
+
+import pytest
+
+
+@pytest.fixture
+def set_config():
+    """修改全局配置，测试结束后恢复原值"""
+    # 延迟导入：导入config时会在当前目录创建文件夹，需在切换到临时目录之后
+    from config_manager import config
+    originals = {}
+    
+    def _set(key_path, value):
+        originals.setdefault(key_path, config.get(key_path))
+        config.set(key_path, value)
+    
+    yield _set
+    for key_path, value in originals.items():
+        config.set(key_path, value)
@@ -0,0 +1,263 @@
+"""
+批量处理的读取、合并和报告流程：合并结果与原有流程一致，
+并行/顺序读取、是否使用缓存、是否安装python-calamine都不影响结果
+"""
+import importlib.util
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+import utils
+from batch_processor import BatchProcessor
+from utils import DataUtils
+
+_HAS_CALAMINE = importlib.util.find_spec('python_calamine') is not None
+
+# 原有流程对 input_folder 中三个文件的合并结果（不含处理时间列），用于回归比较
+EXPECTED_COLUMNS = ['编号', '严重级别', '问题描述', '功能模块', '文件来源', '修复状态', '布尔', '日期',
+                    '文件来源.1', '处理时间', '类型', '严重级别.1', '处理时间.1']
+EXPECTED_VALUES = {
+    '编号': [1.0, 2.0, 3.0, np.nan, 10.0, 11.0, 12.0],
+    '严重级别': ['S-严重', 'A-重要', None, 'C-轻微', 'S', None, 'C'],
+    '问题描述': ['闪退', None, '卡顿', '错别字', None, None, None],
+    '功能模块': ['登录', '支付', None, '首页', None, None, None],
+    '文件来源': ['a', 'b', None, 'c'] + ['bug记录0814_李四.xlsx'] * 3,
+    '修复状态': ['未修复', '已修复', '未修复', '未修复', '未修复', '未修复', '未修复'],
+    '布尔': [1.0, np.nan, 0.0, 1.0, np.nan, np.nan, np.nan],
+    '日期': [datetime(2024, 1, 2), datetime(2024, 1, 3), None, datetime(2024, 1, 5, 10, 30), None, None, None],
+    '文件来源.1': ['bug记录0813_王超.xlsx'] * 4 + [None] * 3,
+    '类型': ['非程序Bug', '非程序Bug', '非程序Bug', '非程序Bug', '程序Bug', None, '非程序Bug'],
+    '严重级别.1': [None, None, None, None, None, 'B', 'C'],
+}
+
+
+def _save_workbook(path, sheets):
+    """按 [(工作表名, 行列表)] 生成工作簿"""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name, rows in sheets:
+        worksheet = workbook.create_sheet(sheet_name)
+        for row in rows:
+            worksheet.append(row)
+    workbook.save(path)
+
+
+@pytest.fixture
+def input_folder(tmp_path):
+    """
+    三个输入文件：第一个的Bug记录不在第一个工作表，且已有“文件来源_1”列；
+    第二个有重复列名、“处理时间_1”列、已有的类型列和Unnamed列；
+    第三个第一行为空，所有列都是Unnamed，清理后为空
+    """
+    folder = tmp_path / 'input'
+    folder.mkdir()
+    _save_workbook(folder / 'bug记录0813_王超.xlsx', [
+        ('说明', [['说明'], ['x']]),
+        ('Bug记录', [
+            ['编号', '严重级别', '问题描述', '功能模块', '文件来源_1', '修复状态', '布尔', '日期'],
+            ['001', 'S-严重', '闪退', '登录', 'a', None, True, datetime(2024, 1, 2)],
+            [2, 'A-重要', '#N/A', '支付', 'b', '已修复', None, datetime(2024, 1, 3)],
+            [],
+            [3, 'NA', '卡顿', None, None, None, False, None],
+            ['#N/A', 'C-轻微', '错别字', '首页', 'c', '未修复', True, datetime(2024, 1, 5, 10, 30)],
+        ]),
+    ])
+    _save_workbook(folder / 'bug记录0814_李四.xlsx', [
+        ('Sheet1', [
+            ['编号', '严重级别', '严重级别', '处理时间_1', '类型', 'Unnamed: 9'],
+            [10, 'S', None, 't1', '程序Bug', 1],
+            [11, None, 'B', None, None, 2],
+            [None, None, None, None, None, None],
+            [12, 'C', 'C', 't3', '非程序Bug', 3],
+        ]),
+    ])
+    _save_workbook(folder / 'bug记录0815_张三.xlsx', [
+        ('Sheet1', [
+            [None, None, None],
+            ['编号', '严重级别', '功能模块'],
+            [1, 'S', '登录'],
+            [2, 'A', None],
+        ]),
+    ])
+    # 临时文件不参与处理
+    (folder / '~$bug记录0813_王超.xlsx').write_bytes(b'')
+    return folder
+
+
+def _as_object(series):
+    """category和字符串类型转回object，缺失值统一为None，便于与期望值比较"""
+    values = series.astype(object)
+    return values.where(values.notna(), None).tolist()
+
+
+def _assert_expected_merge(merged_df):
+    assert list(merged_df.columns) == EXPECTED_COLUMNS
+    assert len(merged_df) == 7
+    for col, expected in EXPECTED_VALUES.items():
+        if col in ('编号', '布尔'):
+            np.testing.assert_array_equal(merged_df[col].to_numpy(dtype=float), expected)
+        elif col == '日期':
+            pd.testing.assert_series_equal(merged_df[col], pd.Series(pd.to_datetime(expected), name=col))
+        else:
+            assert _as_object(merged_df[col]) == expected, col
+    # 第二个文件自带的“处理时间_1”清理为“处理时间”，本次运行的处理时间顺延为“处理时间.1”；
+    # 同一次运行的所有文件使用相同的处理时间
+    timestamp = merged_df['处理时间'].iloc[0]
+    assert _as_object(merged_df['处理时间']) == [timestamp] * 4 + ['t1', None, 't3']
+    assert _as_object(merged_df['处理时间.1']) == [None] * 4 + [timestamp] * 3
+
+
+@pytest.mark.parametrize('use_calamine', [False, True])
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_merge_matches_original(input_folder, monkeypatch, set_config, use_calamine, max_workers):
+    if use_calamine and not _HAS_CALAMINE:
+        pytest.skip('未安装python-calamine')
+    monkeypatch.setattr(utils, '_HAS_CALAMINE', use_calamine)
+    set_config('excel.max_workers', max_workers)
+    processor = BatchProcessor(input_folder=input_folder)
+    file_data = processor.read_all_files()
+    # 清理后为空的文件不参与合并，其余按文件名顺序合并
+    assert list(file_data) == ['bug记录0813_王超.xlsx', 'bug记录0814_李四.xlsx']
+    _assert_expected_merge(processor.merge_data(file_data))
+
+
+def test_merge_with_cache_matches_original(input_folder, set_config):
+    set_config('cache.enabled', True)
+    set_config('excel.max_workers', 1)
+    # 第一次解析并写入缓存，第二次从缓存读取，结果相同
+    for _ in range(2):
+        processor = BatchProcessor(input_folder=input_folder)
+        _assert_expected_merge(processor.merge_data(processor.read_all_files()))
+
+
+def test_metadata_columns_follow_config(input_folder, set_config):
+    set_config('excel.max_workers', 1)
+    set_config('report.include_source_column', False)
+    set_config('report.include_timestamp', False)
+    processor = BatchProcessor(input_folder=input_folder)
+    merged_df = processor.merge_data(processor.read_all_files())
+    assert list(merged_df.columns) == ['编号', '严重级别', '问题描述', '功能模块', '文件来源', '修复状态',
+                                       '布尔', '日期', '类型', '严重级别.1', '处理时间']
+    assert _as_object(merged_df['文件来源']) == ['a', 'b', None, 'c', None, None, None]
+
+
+def test_single_file_merge(input_folder, set_config):
+    set_config('excel.max_workers', 1)
+    for name in ('bug记录0814_李四.xlsx', 'bug记录0815_张三.xlsx'):
+        (input_folder / name).unlink()
+    processor = BatchProcessor(input_folder=input_folder)
+    file_data = processor.read_all_files()
+    merged_df = processor.merge_data(file_data)
+    assert list(merged_df.index) == list(range(4))
+    assert _as_object(merged_df['修复状态']) == ['未修复', '已修复', '未修复', '未修复']
+    # 合并后修改列不影响读取结果
+    merged_df['修复状态'] = '已修复'
+    assert _as_object(file_data['bug记录0813_王超.xlsx']['修复状态'])[0] == '未修复'
+
+
+def test_empty_input_folder(tmp_path):
+    processor = BatchProcessor(input_folder=tmp_path)
+    assert processor.read_all_files() == {}
+    assert processor.merge_data({}).empty
+    assert processor.process_batch() is False
+
+
+def test_clean_column_names():
+    df = pd.DataFrame([['标题', 1, 2, 3, 4]],
+                      columns=['Unnamed: 0', '严重级别', '严重级别.1', '级别_2', 'Unnamed: 4'])
+    cleaned = BatchProcessor._clean_column_names(df)
+    # Unnamed列用第一行的文本命名，第一行是数字时按位置命名；去掉重复后缀后重新编号
+    assert list(cleaned.columns) == ['标题', '严重级别', '严重级别.1', '级别', '列5']
+
+
+def test_clean_column_names_drops_empty_duplicates():
+    # 原始列名相同且有多个有数据的列时，按位置只删除第一个之后的有数据列，同名的其他列保留
+    df = pd.DataFrame([[None, 'S', '登录', 'A'], [' ', 'B', '支付', None]],
+                      columns=['严重级别', '严重级别', '功能模块', '严重级别'])
+    cleaned = BatchProcessor._clean_column_names(df)
+    assert list(cleaned.columns) == ['严重级别', '严重级别.1', '功能模块']
+    assert cleaned['严重级别.1'].tolist() == ['S', 'B']
+    # 同名的列都没有数据时只保留第一个
+    df = pd.DataFrame({'功能模块': ['登录', '支付']})
+    df[['备注', '备注2']] = None
+    df.columns = ['功能模块', '备注', '备注']
+    assert list(BatchProcessor._clean_column_names(df).columns) == ['功能模块', '备注']
+
+
+def _stats_dict(stats_df):
+    """统计报告转为 {统计项: 值}，去掉分隔空行和每次运行不同的处理时间"""
+    return {item: value for item, value in zip(stats_df['统计项'], stats_df['值'])
+            if item and item != '处理时间'}
+
+
+def test_statistics_report(input_folder, set_config):
+    set_config('excel.max_workers', 1)
+    processor = BatchProcessor(input_folder=input_folder)
+    file_data = processor.read_all_files()
+    merged_df = processor.merge_data(file_data)
+
+    # 合并时逐文件累加的统计与直接按合并结果计算的统计相同
+    accumulated = processor._generate_statistics_report(
+        merged_df, list(file_data), processor._get_merge_statistics(merged_df))
+    direct = processor._generate_statistics_report(merged_df, list(file_data))
+    pd.testing.assert_frame_equal(accumulated.iloc[1:].reset_index(drop=True),
+                                  direct.iloc[1:].reset_index(drop=True))
+
+    stats = _stats_dict(accumulated)
+    assert stats['处理文件数'] == 2
+    assert stats['总数据行数'] == 7
+    assert stats['总数据列数'] == len(EXPECTED_COLUMNS)
+    assert stats['总缺失值数'] == merged_df.isnull().sum().sum()
+    assert stats['重复行数'] == merged_df.duplicated().sum()
+    assert stats['  bug记录0814_李四.xlsx'] == 3
+    assert stats['  a'] == 1
+    assert stats['  未修复'] == '6 (85.7%)'
+    assert stats['  程序Bug'] == '1 (14.3%)'
+    assert stats['总体修复率'] == '14.3%'
+
+
+@pytest.mark.parametrize('detail_format', ['xlsx', 'csv'])
+def test_process_batch_writes_reports(input_folder, set_config, tmp_path, detail_format):
+    set_config('excel.max_workers', 1)
+    set_config('report.detail_format', detail_format)
+    output_folder = tmp_path / 'output'
+    output_folder.mkdir()
+    processor = BatchProcessor(input_folder=input_folder)
+    processor.output_folder = output_folder
+    assert processor.process_batch() is True
+
+    detail_files = sorted(output_folder.glob(f'详细分析报告_2*.{detail_format}'))
+    assert len(detail_files) == 1
+    if detail_format == 'csv':
+        detail_df = pd.read_csv(detail_files[0], encoding='utf-8-sig')
+    else:
+        detail_df = pd.read_excel(detail_files[0])
+    assert list(detail_df.columns) == EXPECTED_COLUMNS
+    assert len(detail_df) == 7
+
+    stats_files = list(output_folder.glob('数据统计报告_*.xlsx'))
+    assert len(stats_files) == 1
+    assert _stats_dict(pd.read_excel(stats_files[0]))['总数据行数'] == 7
+
+    unified_files = list(output_folder.glob('详细分析报告_批量分析_*.xlsx'))
+    assert len(unified_files) == 1
+    assert pd.ExcelFile(unified_files[0]).sheet_names == ['详细数据', '分析统计']
+
+
+def test_optimize_dtypes_converts_numeric_objects():
+    processor = BatchProcessor()
+    df = pd.DataFrame({
+        '编号': pd.Series([1, 2.5, None], dtype=object),
+        '编号文本': ['001', '002', '003'],
+        '数量': np.array([1, 2, 3], dtype=np.int64),
+    })
+    optimized = processor._optimize_dtypes(df)
+    assert optimized['编号'].dtype == np.float64
+    # 字符串形式的数字保持为文本，整数列不向下转换
+    assert _as_object(optimized['编号文本']) == ['001', '002', '003']
+    assert optimized['数量'].dtype == np.int64
+    # 文本列转为category或Arrow字符串后，类型统计仍按object计
+    assert DataUtils.dtype_counts(optimized).to_dict() == {'float64': 1, 'object': 1, 'int64': 1}
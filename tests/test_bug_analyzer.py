@@ -0,0 +1,100 @@
+"""
+Bug级别分析：按日期、按类型统计与原有的分组统计结果一致，报告读取和生成
+"""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from bug_analyzer import BugAnalyzer
+from utils import ExcelUtils
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    return BugAnalyzer(input_folder=tmp_path, output_folder=tmp_path)
+
+
+@pytest.fixture
+def bug_df():
+    """类型列为category且类别不按字典序排列，“创建日期”排在“日期”之前"""
+    return pd.DataFrame({
+        '编号': [1, 2, 3, 4, 5, 6],
+        '创建日期': [datetime(2024, 1, 2), datetime(2024, 1, 2), datetime(2024, 1, 1), None,
+                 datetime(2024, 1, 1), datetime(2024, 1, 2)],
+        '类型': pd.Categorical(['程序Bug', '非程序Bug', '程序Bug', '程序Bug', '需求', None],
+                             categories=['非程序Bug', '程序Bug', '需求']),
+        '修复状态': pd.Categorical(['已修复', '未修复', '未修复', '已修复', '已修复', '已修复']),
+        '日期': ['x'] * 6,
+    })
+
+
+def test_analyze_by_date(analyzer, bug_df):
+    result = analyzer.analyze_by_date(bug_df)
+    expected = pd.DataFrame({
+        '创建日期': pd.to_datetime(['2024-01-01', '2024-01-02']),
+        '总数': [2, 3],
+        '程序Bug数': [1, 1],
+        '程序Bug修复数': [0, 1],
+        '非程序Bug数': [0, 1],
+        '非程序Bug修复数': [0, 0],
+        '程序Bug修复率': [0.0, 100.0],
+        '非程序Bug修复率': [0.0, 0.0],
+    })
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_analyze_by_date_without_type_columns(analyzer):
+    df = pd.DataFrame({'编号': [1, 2, 3], '日期': ['0813', '0812', '0813']})
+    result = analyzer.analyze_by_date(df)
+    assert result['日期'].tolist() == ['0812', '0813']
+    assert result['总数'].tolist() == [1, 2]
+    assert (result[['程序Bug数', '程序Bug修复数', '非程序Bug数', '非程序Bug修复数']] == 0).all().all()
+    assert analyzer.analyze_by_date(pd.DataFrame({'编号': [1]})).empty
+
+
+def test_analyze_by_type_sorted_by_value(analyzer, bug_df):
+    result = analyzer.analyze_by_type(bug_df)
+    expected = pd.DataFrame({
+        '类型': ['程序Bug', '需求', '非程序Bug'],
+        '总数': [3, 1, 1],
+        '已修复数': [2, 1, 0],
+        '修复率': [66.67, 100.0, 0.0],
+    })
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    # 与对object列分组的结果相同
+    as_object = bug_df.astype({'类型': object, '修复状态': object})
+    pd.testing.assert_frame_equal(analyzer.analyze_by_type(as_object), result, check_dtype=False)
+
+
+def test_analyze_by_type_without_type_column(analyzer):
+    df = pd.DataFrame({'编号': [1, 2]})
+    result = analyzer.analyze_by_type(df)
+    assert result.to_dict('list') == {'类型': ['非程序Bug'], '总数': [2], '已修复数': [0], '修复率': [0.0]}
+    # 不修改调用方的数据
+    assert list(df.columns) == ['编号']
+
+
+def test_read_report_data_sheet_fallback(analyzer, tmp_path):
+    report = tmp_path / '详细分析报告_批量分析_20240101_000000.xlsx'
+    ExcelUtils.save_excel_with_sheets(str(report), {'分析统计': pd.DataFrame({'统计项': ['a']}),
+                                                    '完整数据': pd.DataFrame({'编号': [1, 2]})})
+    assert analyzer.read_report_data(report)['编号'].tolist() == [1, 2]
+
+    other = tmp_path / 'other.xlsx'
+    ExcelUtils.save_excel_with_sheets(str(other), {'其他': pd.DataFrame({'编号': [3]})})
+    assert analyzer.read_report_data(other)['编号'].tolist() == [3]
+
+    # 没有指定文件时读取输出文件夹中最新的详细分析报告
+    assert analyzer.read_report_data()['编号'].tolist() == [1, 2]
+    assert analyzer.latest_report_file == report
+
+
+def test_generate_bug_analysis_report(analyzer, bug_df, tmp_path):
+    analyzer.generate_bug_analysis_report(bug_df)
+    reports = list(tmp_path.glob('Bug级别分析报告_*.xlsx'))
+    assert len(reports) == 1
+    with pd.ExcelFile(reports[0]) as excel_file:
+        assert excel_file.sheet_names == ['按日期分析', '按类型分析', '原始数据', '分析汇总']
+        summary = excel_file.parse('分析汇总')
+    assert summary['数值'].tolist()[:3] == [6, 2, 3]
@@ -0,0 +1,94 @@
+"""
+数据验证：报告查找、数据完整性检查、丢失数据分析和报告结构验证
+"""
+import os
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from data_validator import DataValidator
+from utils import ExcelUtils
+
+
+@pytest.fixture
+def validator(tmp_path):
+    return DataValidator(output_folder=tmp_path)
+
+
+@pytest.fixture
+def original_file(tmp_path):
+    """原始文件：中间有空行，末尾有带格式的空行"""
+    workbook = Workbook()
+    worksheet = workbook.active
+    for row in (['编号', '严重级别'], [1, 'S-严重'], [], [2, 'A-重要'], [3, 'S-严重']):
+        worksheet.append(row)
+    worksheet.cell(row=10, column=1).number_format = '0.00'
+    path = tmp_path / 'bug记录0813_王超.xlsx'
+    workbook.save(path)
+    return str(path)
+
+
+@pytest.fixture
+def merged_file(tmp_path):
+    path = tmp_path / '详细分析报告_20240101_000000.xlsx'
+    merged_df = pd.DataFrame({
+        '编号': [1, 2, 3, 10, 11],
+        '严重级别': ['S-严重', 'A-重要', 'S-严重', 'S-严重', None],
+        '功能模块': ['登录', None, '支付', '首页', '首页'],
+        '文件来源': ['bug记录0813_王超.xlsx'] * 3 + ['bug记录0814_李四.xlsx'] * 2,
+    })
+    ExcelUtils.save_excel_with_sheets(str(path), {'详细分析报告': merged_df})
+    return str(path)
+
+
+def test_find_latest_report_defaults_to_xlsx(validator, tmp_path, merged_file):
+    # 详细分析报告保存为csv时，按Excel读取的检查仍使用最新的xlsx报告
+    csv_report = tmp_path / '详细分析报告_20240102_000000.csv'
+    csv_report.write_text('编号\n1\n', encoding='utf-8-sig')
+    os.utime(merged_file, (1000, 1000))
+    assert validator.find_latest_report() == tmp_path / os.path.basename(merged_file)
+    assert validator.find_latest_report(extension='csv') == csv_report
+    assert validator.find_latest_report('数据统计报告') is None
+
+
+def test_check_data_integrity(validator, original_file, merged_file):
+    # 原始文件中间的空行与pandas读取时一样计入行数
+    assert ExcelUtils.count_data_rows(original_file) == len(pd.read_excel(original_file)) == 4
+    assert validator.check_data_integrity(original_file, merged_file, '文件来源', '0813') is False
+    assert validator.check_data_integrity(original_file, merged_file, '文件来源', '0814') is False
+
+
+def test_check_data_integrity_complete(validator, tmp_path, merged_file):
+    workbook = Workbook()
+    for row in (['编号'], [10], [11]):
+        workbook.active.append(row)
+    path = tmp_path / 'bug记录0814_李四.xlsx'
+    workbook.save(path)
+    assert validator.check_data_integrity(str(path), merged_file, '文件来源', '0814') is True
+    assert validator.check_data_integrity(str(path), merged_file, '文件来源', 'bug记录0814_李四.xlsx',
+                                          match_mode='equals') is True
+    assert validator.check_data_integrity(str(path), merged_file, '文件来源', r'08(?:14|15)',
+                                          match_mode='regex') is True
+
+
+def test_analyze_missing_data(validator, merged_file):
+    result = validator.analyze_missing_data(merged_file, '文件来源', '0813')
+    assert result['total_rows'] == 3
+    assert result['level_distribution'] == {'S-严重': 2, 'A-重要': 1}
+    assert result['null_counts'] == {'编号': 0, '严重级别': 0, '功能模块': 1}
+
+
+def test_validate_report_structure(validator, tmp_path):
+    path = tmp_path / '详细分析报告_批量分析_20240101_000000.xlsx'
+    ExcelUtils.save_excel_with_sheets(str(path), {'详细数据': pd.DataFrame({'编号': [1, 2]}),
+                                                  '分析统计': pd.DataFrame({'统计项': ['总数据行数'], '值': [2]})})
+    result = validator.validate_report_structure(str(path))
+    assert result['valid'] is True
+    assert result['sheet_names'] == ['详细数据', '分析统计']
+    assert result['issues'] == []
+
+    ExcelUtils.save_excel_with_sheets(str(path), {'详细数据': pd.DataFrame({'编号': [1]})})
+    result = validator.validate_report_structure(str(path))
+    assert result['valid'] is False
+    assert result['issues'] == ['缺少必需工作表: 分析统计']
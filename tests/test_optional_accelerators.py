@@ -0,0 +1,195 @@
+"""
+可选加速组件（python-calamine、pyarrow）安装与未安装时的处理结果应一致，
+读取结果应与直接调用 pd.read_excel 相同
+"""
+import importlib.util
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+import utils
+import batch_processor
+from config_manager import config
+from utils import DataUtils, ExcelUtils, FileUtils
+from batch_processor import BatchProcessor
+
+_HAS_CALAMINE = importlib.util.find_spec('python_calamine') is not None
+_HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+
+@pytest.fixture(params=['without', 'with'])
+def calamine(request, monkeypatch):
+    """分别在不使用和使用python-calamine的情况下运行"""
+    if request.param == 'with' and not _HAS_CALAMINE:
+        pytest.skip('未安装python-calamine')
+    monkeypatch.setattr(utils, '_HAS_CALAMINE', request.param == 'with')
+    return request.param
+
+
+@pytest.fixture(params=['without', 'with'])
+def pyarrow(request, monkeypatch):
+    """分别在不使用和使用pyarrow的情况下运行"""
+    if request.param == 'with' and not _HAS_PYARROW:
+        pytest.skip('未安装pyarrow')
+    monkeypatch.setattr(utils, '_HAS_PYARROW', request.param == 'with')
+    monkeypatch.setattr(batch_processor, '_HAS_PYARROW', request.param == 'with')
+    return request.param
+
+
+@pytest.fixture
+def detail_format():
+    """修改详细分析报告格式，测试结束后恢复"""
+    original = config.get('report.detail_format')
+    yield lambda value: config.set('report.detail_format', value)
+    config.set('report.detail_format', original)
+
+
+def _save_workbook(path, sheets):
+    """按 [(工作表名, 行列表)] 生成工作簿"""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name, rows in sheets:
+        worksheet = workbook.create_sheet(sheet_name)
+        for row in rows:
+            worksheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+@pytest.fixture
+def bug_workbook(tmp_path):
+    """中间有空行、末尾有空行，包含错误值、缺失值文本、编号文本和带空值的布尔列的Bug记录"""
+    return _save_workbook(tmp_path / 'bug记录0813_王超.xlsx', [
+        ('说明', [['填写说明'], ['每行一个问题']]),
+        ('Bug记录', [
+            ['编号', '严重级别', '问题描述', '功能模块', '已复现', '日期'],
+            ['001', 'S-严重', '闪退', '登录', True, datetime(2024, 1, 2)],
+            [2, 'A-重要', '#N/A', '支付', None, datetime(2024, 1, 3)],
+            [],
+            [3, 'NA', '卡顿', None, False, None],
+            ['#N/A', 'C-轻微', '错别字', '首页', True, datetime(2024, 1, 5, 10, 30)],
+            [],
+            [],
+        ]),
+    ])
+
+
+@pytest.fixture
+def blank_header_workbook(tmp_path):
+    """第一行为空，表头在第二行；pandas按第一行作表头，得到Unnamed列"""
+    return _save_workbook(tmp_path / 'bug记录0815_张三.xlsx', [
+        ('Sheet1', [
+            [None, None, None],
+            ['编号', '严重级别', '功能模块'],
+            [1, 'S', '登录'],
+            [2, 'A', None],
+        ]),
+    ])
+
+
+def _smart_reference(path):
+    """原有的智能读取流程：读取所有工作表，选第一个包含Bug列的工作表，删除完全为空的行"""
+    all_sheets = pd.read_excel(path, sheet_name=None, engine='openpyxl')
+    bug_columns = config.get_bug_columns()
+    main_df = next((df for df in all_sheets.values()
+                    if any(any(keyword in str(col) for keyword in bug_columns) for col in df.columns)),
+                   list(all_sheets.values())[0])
+    return main_df.dropna(how='all').reset_index(drop=True)
+
+
+@pytest.mark.parametrize('workbook', ['bug_workbook', 'blank_header_workbook'])
+def test_read_excel_matches_pandas(workbook, calamine, request):
+    path = request.getfixturevalue(workbook)
+    for sheet_name in pd.ExcelFile(path).sheet_names:
+        pd.testing.assert_frame_equal(ExcelUtils.read_excel(path, sheet_name=sheet_name),
+                                      pd.read_excel(path, sheet_name=sheet_name, engine='openpyxl'))
+
+
+def test_read_excel_usecols_matches_pandas(bug_workbook, calamine):
+    pd.testing.assert_frame_equal(
+        ExcelUtils.read_excel(bug_workbook, sheet_name='Bug记录', usecols=['严重级别', '功能模块']),
+        pd.read_excel(bug_workbook, sheet_name='Bug记录', usecols=['严重级别', '功能模块'], engine='openpyxl'))
+
+
+@pytest.mark.parametrize('workbook', ['bug_workbook', 'blank_header_workbook'])
+def test_read_excel_smart_matches_original(workbook, calamine, request):
+    path = request.getfixturevalue(workbook)
+    pd.testing.assert_frame_equal(ExcelUtils.read_excel_smart(path), _smart_reference(path))
+
+
+def test_read_excel_smart_selects_bug_sheet(bug_workbook, calamine):
+    df = ExcelUtils.read_excel_smart(bug_workbook)
+    assert list(df.columns) == ['编号', '严重级别', '问题描述', '功能模块', '已复现', '日期']
+    # 中间的空行删除，其余行保持原有顺序
+    assert len(df) == 4
+
+
+def test_blank_first_row_gives_unnamed_columns(blank_header_workbook, calamine):
+    df = ExcelUtils.read_excel_smart(blank_header_workbook)
+    assert list(df.columns) == ['Unnamed: 0', 'Unnamed: 1', 'Unnamed: 2']
+    assert df.iloc[0].tolist() == ['编号', '严重级别', '功能模块']
+
+
+def test_cell_values_follow_pandas_inference(bug_workbook, calamine):
+    df = ExcelUtils.read_excel_smart(bug_workbook)
+    # 错误值和缺失值文本读取为缺失值，数字文本按数值推断
+    assert df['编号'].tolist()[:3] == [1, 2, 3]
+    assert df['编号'].isna().sum() == 1
+    assert df['问题描述'].isna().sum() == 1
+    assert df['严重级别'].isna().sum() == 1
+    # 带空值的布尔列与pandas一样读取为浮点数
+    assert df['已复现'].dtype == np.float64
+    assert df['已复现'].isna().sum() == 1
+    assert df['日期'].dtype == 'datetime64[ns]'
+
+
+def test_count_data_rows_matches_pandas(bug_workbook, blank_header_workbook):
+    assert ExcelUtils.count_data_rows(bug_workbook, 'Bug记录') == len(pd.read_excel(bug_workbook, sheet_name='Bug记录'))
+    assert ExcelUtils.count_data_rows(bug_workbook) == len(pd.read_excel(bug_workbook))
+    assert ExcelUtils.count_data_rows(blank_header_workbook) == len(pd.read_excel(blank_header_workbook))
+
+
+def test_empty_sheet(tmp_path, calamine):
+    path = _save_workbook(tmp_path / 'empty.xlsx', [('Sheet1', [])])
+    assert ExcelUtils.read_excel(path).empty
+    assert ExcelUtils.read_excel_smart(path).empty
+    assert ExcelUtils.count_data_rows(path) == 0
+
+
+def test_detail_format_falls_back_to_xlsx(detail_format, pyarrow):
+    detail_format('parquet')
+    assert FileUtils.get_detail_format() == ('parquet' if pyarrow == 'with' else 'xlsx')
+    detail_format('xls')
+    assert FileUtils.get_detail_format() == 'xlsx'
+    detail_format('csv')
+    assert FileUtils.get_detail_format() == 'csv'
+
+
+def test_parquet_detail_report_with_mixed_column(tmp_path):
+    if not _HAS_PYARROW:
+        pytest.skip('未安装pyarrow')
+    df = pd.DataFrame({'编号': [1, 'B-2', None], '级别': ['S级', 'A级', 'B级']})
+    path = tmp_path / 'detail.parquet'
+    BatchProcessor._parquet_compatible(df).to_parquet(path, index=False)
+    result = pd.read_parquet(path)
+    assert result['编号'].tolist()[:2] == ['1', 'B-2']
+    assert pd.isna(result['编号'].iloc[2])
+    assert result['级别'].tolist() == ['S级', 'A级', 'B级']
+
+
+def test_optimize_dtypes_keeps_report_dtypes(pyarrow):
+    rows = 200
+    df = pd.DataFrame({
+        '编号': np.arange(rows, dtype=np.int64),
+        '问题描述': [f'问题{i}' for i in range(rows)],
+        '功能模块': ['登录', '支付'] * (rows // 2),
+    })
+    before = DataUtils.dtype_counts(df)
+    optimized = BatchProcessor()._optimize_dtypes(df)
+    assert optimized['编号'].dtype == np.int64
+    pd.testing.assert_series_equal(DataUtils.dtype_counts(optimized), before)
+    pd.testing.assert_series_equal(DataUtils.value_counts_stable(optimized['功能模块']),
+                                   DataUtils.value_counts_stable(df['功能模块']))
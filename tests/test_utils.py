@@ -0,0 +1,197 @@
+"""
+工具类：无用列和空行清理、数据缓存、Excel写入以及计数和文件名解析
+"""
+import os
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import CacheUtils, DataUtils, ExcelUtils, FileUtils, TextUtils
+
+
+@pytest.fixture
+def cache_dir(tmp_path, set_config):
+    """启用缓存并使用独立的缓存目录，清空本进程的内存缓存"""
+    folder = tmp_path / 'cache'
+    folder.mkdir()
+    set_config('cache.enabled', True)
+    set_config('folders.cache', str(folder))
+    CacheUtils._memory_cache.clear()
+    yield folder
+    CacheUtils._memory_cache.clear()
+
+
+def test_remove_useless_columns_matches_substrings(set_config):
+    df = pd.DataFrame(columns=['编号', 'Unnamed: 3', '备注unnamed:1', '级别 (Unnamed: 2)', 0])
+    # 列名包含配置的文本即删除，不要求以其开头
+    assert list(DataUtils.remove_useless_columns(df.reindex([0])).columns) == ['编号', 0]
+
+    set_config('data_cleaning.unnamed_column_patterns', ['备注', '(x)'])
+    assert list(DataUtils.remove_useless_columns(df.reindex([0])).columns) == ['编号', 'Unnamed: 3',
+                                                                               '级别 (Unnamed: 2)', 0]
+    set_config('data_cleaning.unnamed_column_patterns', [])
+    assert DataUtils.remove_useless_columns(df.reindex([0])).shape[1] == 5
+    set_config('data_cleaning.unnamed_column_patterns', ['Unnamed:'])
+    set_config('data_cleaning.remove_unnamed_columns', False)
+    assert DataUtils.remove_useless_columns(df.reindex([0])).shape[1] == 5
+
+
+def test_clean_dataframe_matches_dropna():
+    df = pd.DataFrame({'编号': [1, None, 3, None], 'Unnamed: 1': [None, 'x', None, None],
+                       '级别': ['S', None, None, None]}, index=[5, 6, 7, 8])
+    cleaned = DataUtils.clean_dataframe(df)
+    expected = df.drop(columns='Unnamed: 1').dropna(how='all').reset_index(drop=True)
+    pd.testing.assert_frame_equal(cleaned, expected)
+
+
+def test_drop_empty_rows_keeps_frame_without_empty_rows():
+    df = pd.DataFrame({'编号': [1, 2]})
+    assert DataUtils.drop_empty_rows(df) is df
+    shifted = pd.DataFrame({'编号': [1, 2]}, index=[3, 4])
+    assert list(DataUtils.drop_empty_rows(shifted).index) == [0, 1]
+    assert list(shifted.index) == [3, 4]
+
+
+def test_cache_round_trip(tmp_path, cache_dir):
+    source = tmp_path / 'bug记录0813_王超.xlsx'
+    source.write_bytes(b'v1')
+    df = pd.DataFrame({'编号': [1, 2], '级别': ['S', 'A']})
+
+    assert CacheUtils.load_dataframe(str(source)) is None
+    assert CacheUtils.save_dataframe(str(source), df)
+    cache_files = list(cache_dir.glob('*.pkl'))
+    assert [path.name for path in cache_files] == [CacheUtils.get_cache_path(str(source)).name]
+
+    # 内存缓存和磁盘缓存都返回相同的数据，调用方增加列不影响缓存
+    loaded = CacheUtils.load_dataframe(str(source))
+    pd.testing.assert_frame_equal(loaded, df)
+    loaded['文件来源'] = 'x'
+    CacheUtils._memory_cache.clear()
+    pd.testing.assert_frame_equal(CacheUtils.load_dataframe(str(source)), df)
+
+
+def test_cache_prunes_stale_entries(tmp_path, cache_dir):
+    source = tmp_path / 'bug记录0813_王超.xlsx'
+    other = tmp_path / 'bug记录0814_李四.xlsx'
+    other.write_bytes(b'other')
+    CacheUtils.save_dataframe(str(other), pd.DataFrame({'编号': [9]}))
+
+    source.write_bytes(b'v1')
+    CacheUtils.save_dataframe(str(source), pd.DataFrame({'编号': [1]}))
+    source.write_bytes(b'version 2')
+    CacheUtils.save_dataframe(str(source), pd.DataFrame({'编号': [2]}))
+
+    # 同一文件只保留最新内容的缓存，其他文件的缓存不受影响
+    names = sorted(path.name for path in cache_dir.glob('*.pkl'))
+    assert names == sorted([CacheUtils.get_cache_path(str(source)).name, CacheUtils.get_cache_path(str(other)).name])
+    CacheUtils._memory_cache.clear()
+    assert CacheUtils.load_dataframe(str(source))['编号'].tolist() == [2]
+
+
+def test_cache_disabled(tmp_path, set_config):
+    set_config('cache.enabled', False)
+    source = tmp_path / 'a.xlsx'
+    source.write_bytes(b'v1')
+    assert CacheUtils.get_cache_dir() is None
+    assert CacheUtils.get_cache_path(str(source)) is None
+    assert CacheUtils.save_dataframe(str(source), pd.DataFrame({'编号': [1]})) is False
+    assert CacheUtils.load_dataframe(str(source)) is None
+
+
+def test_memory_cache_is_bounded(tmp_path, cache_dir):
+    for idx in range(CacheUtils.MEMORY_CACHE_SIZE + 3):
+        source = tmp_path / f'file{idx}.xlsx'
+        source.write_bytes(str(idx).encode())
+        CacheUtils.save_dataframe(str(source), pd.DataFrame({'编号': [idx]}))
+    assert len(CacheUtils._memory_cache) == CacheUtils.MEMORY_CACHE_SIZE
+
+
+def _write_sheet_df():
+    return pd.DataFrame({
+        '编号': [1, 2, 3],
+        '数值': [1.5, np.nan, np.inf],
+        '混合': [1, 'B-2', Decimal('3.5')],
+        '日期时间': pd.to_datetime(['2024-01-02 10:30', None, '2024-01-03 00:00']),
+        '日期': [date(2024, 1, 2), None, date(2024, 1, 4)],
+        '布尔': [True, False, True],
+        '级别': pd.Categorical(['S级', 'A级', None]),
+    })
+
+
+def test_save_excel_matches_to_excel(tmp_path):
+    df = _write_sheet_df()
+    saved_path = tmp_path / 'saved.xlsx'
+    reference_path = tmp_path / 'reference.xlsx'
+    assert ExcelUtils.save_excel_with_sheets(str(saved_path), {'详细数据': df, '空表': pd.DataFrame()})
+    with pd.ExcelWriter(reference_path, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='详细数据', index=False)
+
+    pd.testing.assert_frame_equal(pd.read_excel(saved_path, sheet_name='详细数据'),
+                                  pd.read_excel(reference_path, sheet_name='详细数据'))
+    # 空数据写入说明
+    assert pd.read_excel(saved_path, sheet_name='空表')['说明'].tolist() == ['空表数据为空']
+
+
+def test_save_excel_writes_formula_like_text_as_text(tmp_path):
+    path = tmp_path / 'stats.xlsx'
+    df = pd.DataFrame({'统计项': ['=== 数据规模 ===', '+1', 'http://example.com', '001'], '值': ['', 1, 2, 3]})
+    assert ExcelUtils.save_excel_with_sheets(str(path), {'统计': df})
+    result = pd.read_excel(path, dtype={'统计项': str})
+    assert result['统计项'].tolist() == ['=== 数据规模 ===', '+1', 'http://example.com', '001']
+
+
+def test_value_counts_stable_ignores_dtype():
+    values = ['登录', '支付', '登录', None, '首页', '支付']
+    expected = DataUtils.value_counts_stable(pd.Series(values, dtype=object))
+    assert expected.to_dict() == {'登录': 2, '支付': 2, '首页': 1}
+    assert list(expected.index) == ['登录', '支付', '首页']
+    for dtype in ('category', 'string'):
+        pd.testing.assert_series_equal(DataUtils.value_counts_stable(pd.Series(values, dtype=dtype)), expected)
+
+
+def test_count_nulls_and_duplicates():
+    df = pd.DataFrame({'编号': [1, 1, None, 1], '级别': ['S', 'S', None, 'S']})
+    pd.testing.assert_series_equal(DataUtils.count_nulls(df), df.isnull().sum(), check_names=False)
+    assert DataUtils.count_duplicate_rows(df) == df.duplicated().sum()
+
+
+def test_count_duplicate_rows_with_hashing(monkeypatch):
+    monkeypatch.setattr(DataUtils, 'HASH_DUPLICATE_MIN_ROWS', 1)
+    df = pd.DataFrame({'编号': [1, 2, 1, 2, 3], '级别': pd.Categorical(['S', 'A', 'S', 'B', None])})
+    assert DataUtils.count_duplicate_rows(df) == df.duplicated().sum()
+
+
+@pytest.mark.parametrize('filename, expected', [
+    ('bug记录0813_王超.xlsx', '0813_王超'),
+    ('测试记录8月13日_赵敏.xlsx', '0813_赵敏'),
+    ('bug统计.xlsx', '未识别_质检'),
+    (None, '未识别_质检'),
+])
+def test_extract_date_and_tester(filename, expected):
+    assert TextUtils.extract_date_and_tester(filename) == expected
+
+
+def test_extract_date_and_tester_series():
+    filenames = pd.Series(['bug记录0813_王超.xlsx', None, 'bug记录0813_王超.xlsx'], index=[3, 4, 5])
+    result = TextUtils.extract_date_and_tester_series(filenames)
+    assert result.to_dict() == {3: '0813_王超', 4: '未识别_质检', 5: '0813_王超'}
+
+
+def test_get_excel_files_skips_temp_files(tmp_path):
+    for name in ('b.xlsx', 'a.xls', '~$a.xlsx', '.~b.xlsx', 'c.csv'):
+        (tmp_path / name).write_bytes(b'')
+    assert [path.name for path in FileUtils.get_excel_files(str(tmp_path))] == ['a.xls', 'b.xlsx']
+
+
+def test_find_latest_file(tmp_path):
+    older = tmp_path / '详细分析报告_20240101_000000.xlsx'
+    newer = tmp_path / '详细分析报告_20240102_000000.xlsx'
+    for mtime, path in ((1000, older), (2000, newer)):
+        path.write_bytes(b'')
+        os.utime(path, (mtime, mtime))
+    (tmp_path / '详细分析报告_20240103_000000.csv').write_bytes(b'')
+    assert FileUtils.find_latest_file(str(tmp_path), '详细分析报告_*.xlsx') == newer
+    assert FileUtils.find_latest_file(str(tmp_path), '统计*.xlsx') is None
@@ -3,21 +3,52 @@
 """
 import re
 import os
+import fnmatch
 import sys
-import subprocess
+import hashlib
+import importlib.util
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, time
 from typing import Optional, List, Dict, Any
+import numpy as np
 import pandas as pd
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+from openpyxl import load_workbook
 
 from config_manager import config
 from logger_config import LoggerConfig
 
 logger = LoggerConfig.get_logger(__name__)
 
+# 安装了python-calamine时使用其Rust实现解析Excel，否则使用openpyxl
+_HAS_CALAMINE = importlib.util.find_spec('python_calamine') is not None
+
+# 安装了pyarrow时，详细分析报告可以保存为parquet
+_HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
 class FileUtils:
     """文件操作工具类"""
     
+    # 详细分析报告支持的保存格式
+    DETAIL_FORMATS = ('xlsx', 'csv', 'parquet')
+    
+    @staticmethod
+    def get_detail_format() -> str:
+        """
+        获取详细分析报告实际使用的保存格式（即文件扩展名）
+        
+        Returns:
+            str: 'xlsx'、'csv' 或 'parquet'；配置的格式不支持或parquet未安装pyarrow时为'xlsx'
+        """
+        detail_format = str(config.get_report_config().get('detail_format', 'xlsx')).lower().lstrip('.')
+        if detail_format not in FileUtils.DETAIL_FORMATS or (detail_format == 'parquet' and not _HAS_PYARROW):
+            return 'xlsx'
+        return detail_format
+    
     @staticmethod
     def is_excel_file(file_path: str) -> bool:
         """
@@ -42,8 +73,7 @@ class FileUtils:
         Returns:
             bool: 是否为临时文件
         """
-        filename = Path(file_path).name
-        return filename.startswith('~$') or filename.startswith('.~')
+        return os.path.basename(file_path).startswith(('~$', '.~'))
     
     @staticmethod
     def get_excel_files(folder_path: str) -> List[Path]:
@@ -75,6 +105,20 @@ class FileUtils:
         logger.info(f"在 {folder_path} 中找到 {len(excel_files)} 个Excel文件")
         return excel_files
     
+    @staticmethod
+    def get_file_signature(file_path: str) -> tuple:
+        """
+        获取文件签名，用于判断文件内容是否变化
+        
+        Args:
+            file_path (str): 文件路径
+            
+        Returns:
+            tuple: (修改时间纳秒数, 文件大小)
+        """
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+    
     @staticmethod
     def open_file(file_path: str) -> bool:
         """
@@ -89,10 +133,14 @@ class FileUtils:
         try:
             if sys.platform.startswith('win'):
                 os.startfile(file_path)
-            elif sys.platform.startswith('darwin'):
-                subprocess.call(['open', file_path])
             else:
-                subprocess.call(['xdg-open', file_path])
+                # 只在非Windows系统打开文件时才需要，不在每个读取进程启动时导入
+                import subprocess
+                
+                if sys.platform.startswith('darwin'):
+                    subprocess.call(['open', file_path])
+                else:
+                    subprocess.call(['xdg-open', file_path])
             
             logger.info(f"已打开文件: {Path(file_path).name}")
             return True
@@ -102,18 +150,19 @@ class FileUtils:
             return False
     
     @staticmethod
-    def generate_timestamp_filename(prefix: str, suffix: str = '.xlsx') -> str:
+    def generate_timestamp_filename(prefix: str, suffix: str = '.xlsx', now: Optional[datetime] = None) -> str:
         """
         生成带时间戳的文件名
         
         Args:
             prefix (str): 文件名前缀
             suffix (str): 文件扩展名
+            now (datetime, optional): 时间戳使用的时刻，默认为当前时间
             
         Returns:
             str: 带时间戳的文件名
         """
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = (now or datetime.now()).strftime('%Y%m%d_%H%M%S')
         return f"{prefix}_{timestamp}{suffix}"
     
     @staticmethod
@@ -132,18 +181,235 @@ class FileUtils:
         if not folder.exists():
             return None
         
-        matching_files = list(folder.glob(pattern))
-        if not matching_files:
+        # 一次遍历目录并保留修改时间最新的文件；Windows下DirEntry.stat()直接使用目录列表中的信息
+        latest_file = None
+        latest_mtime = None
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if not fnmatch.fnmatch(entry.name, pattern) or not entry.is_file():
+                    continue
+                mtime = entry.stat().st_mtime
+                if latest_mtime is None or mtime > latest_mtime:
+                    latest_mtime = mtime
+                    latest_file = Path(entry.path)
+        
+        if latest_file is None:
             return None
         
-        # 按修改时间排序，返回最新的
-        latest_file = max(matching_files, key=lambda x: x.stat().st_mtime)
         logger.info(f"找到最新文件: {latest_file.name}")
         return latest_file
 
+class CacheUtils:
+    """
+    数据缓存工具类，按文件名和文件内容哈希缓存清理后的DataFrame
+    
+    缓存以pickle格式保存，读取时会反序列化并执行其中的对象构造，
+    缓存目录（默认 output/.cache）只能由本程序写入，不要放入来源不明的 .pkl 文件
+    """
+    
+    # 缓存内容的格式版本，清理流程变化时递增，使旧缓存失效
+    CACHE_VERSION = 3
+    
+    # 本进程已计算的内容哈希：(文件路径, 修改时间, 大小) -> 哈希值
+    _content_hashes = {}
+    
+    # 本进程最近使用的DataFrame：(文件路径, 修改时间, 大小) -> DataFrame，
+    # 同一进程中反复处理同一文件时不再从磁盘反序列化
+    MEMORY_CACHE_SIZE = 16
+    _memory_cache = OrderedDict()
+    _memory_lock = threading.Lock()
+    
+    @staticmethod
+    def _file_signature(file_path: str) -> tuple:
+        """
+        获取文件的 (绝对路径, 修改时间, 大小)，文件修改后即不同
+        
+        Args:
+            file_path (str): 文件路径
+            
+        Returns:
+            tuple: 文件签名
+        """
+        return (str(Path(file_path).resolve()),) + FileUtils.get_file_signature(file_path)
+    
+    @staticmethod
+    def _remember(key: tuple, df: pd.DataFrame):
+        """
+        将DataFrame放入内存缓存，超过容量时淘汰最久未使用的
+        
+        Args:
+            key (tuple): 文件签名
+            df (pd.DataFrame): 数据
+        """
+        with CacheUtils._memory_lock:
+            CacheUtils._memory_cache[key] = df
+            CacheUtils._memory_cache.move_to_end(key)
+            while len(CacheUtils._memory_cache) > CacheUtils.MEMORY_CACHE_SIZE:
+                CacheUtils._memory_cache.popitem(last=False)
+    
+    @staticmethod
+    def get_content_hash(file_path: str) -> str:
+        """
+        计算文件内容的哈希值，文件未修改时复用本进程之前的计算结果
+        
+        Args:
+            file_path (str): 文件路径
+            
+        Returns:
+            str: 十六进制哈希值
+        """
+        signature = CacheUtils._file_signature(file_path)
+        content_hash = CacheUtils._content_hashes.get(signature)
+        if content_hash is None:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            content_hash = digest.hexdigest()
+            CacheUtils._content_hashes[signature] = content_hash
+        return content_hash
+    
+    @staticmethod
+    def _prune_stale(cache_path: Path, file_path: str):
+        """
+        删除同一文件名的旧缓存（文件内容或缓存版本已变化），只保留刚写入的缓存
+        
+        Args:
+            cache_path (Path): 刚写入的缓存路径
+            file_path (str): 源文件路径
+        """
+        stale_pattern = re.compile(rf"{re.escape(Path(file_path).stem)}_[0-9a-f]{{32}}_v\d+\.pkl")
+        with os.scandir(cache_path.parent) as entries:
+            stale_paths = [entry.path for entry in entries
+                           if entry.name != cache_path.name and stale_pattern.fullmatch(entry.name)]
+        for stale_path in stale_paths:
+            try:
+                os.unlink(stale_path)
+            except OSError as e:
+                logger.warning(f"删除旧缓存失败 {os.path.basename(stale_path)}: {e}")
+        if stale_paths:
+            logger.info("已删除 %d 个旧缓存: %s", len(stale_paths), Path(file_path).name)
+    
+    @staticmethod
+    def get_cache_dir() -> Optional[Path]:
+        """
+        按当前配置获取缓存目录
+        
+        Returns:
+            Optional[Path]: 缓存目录，缓存未启用时返回None
+        """
+        if not config.get_cache_config().get('enabled', True):
+            return None
+        return config.get_folder_path('cache')
+    
+    @staticmethod
+    def get_cache_path(file_path: str, cache_dir: Optional[Path] = None) -> Optional[Path]:
+        """
+        获取文件对应的缓存路径，按内容而不是路径和修改时间定位，
+        文件被复制到其他目录（如临时目录）或仅修改时间变化时仍可命中缓存
+        
+        Args:
+            file_path (str): 源文件路径
+            cache_dir (Path, optional): 缓存目录；不指定时按当前配置决定，
+                进程池的子进程不共享主进程修改后的配置，需由主进程显式传入
+            
+        Returns:
+            Optional[Path]: 缓存文件路径，缓存未启用时返回None
+        """
+        if cache_dir is None:
+            cache_dir = CacheUtils.get_cache_dir()
+            if cache_dir is None:
+                return None
+        
+        content_hash = CacheUtils.get_content_hash(file_path)
+        cache_name = f"{Path(file_path).stem}_{content_hash}_v{CacheUtils.CACHE_VERSION}.pkl"
+        return Path(cache_dir) / cache_name
+    
+    @staticmethod
+    def load_dataframe(file_path: str, cache_dir: Optional[Path] = None) -> Optional[pd.DataFrame]:
+        """
+        读取文件的缓存数据
+        
+        Args:
+            file_path (str): 源文件路径
+            cache_dir (Path, optional): 缓存目录，不指定时按当前配置决定
+            
+        Returns:
+            Optional[pd.DataFrame]: 缓存的数据（浅拷贝，调用方增删列不影响缓存），没有可用缓存时返回None
+        """
+        try:
+            if cache_dir is None:
+                cache_dir = CacheUtils.get_cache_dir()
+                if cache_dir is None:
+                    return None
+            
+            # 先查内存缓存，命中时不必计算内容哈希和反序列化
+            key = CacheUtils._file_signature(file_path)
+            with CacheUtils._memory_lock:
+                df = CacheUtils._memory_cache.get(key)
+                if df is not None:
+                    CacheUtils._memory_cache.move_to_end(key)
+            if df is not None:
+                logger.info("使用内存缓存数据: %s, %d 行", Path(file_path).name, len(df))
+                return df.copy(deep=False)
+            
+            cache_path = CacheUtils.get_cache_path(file_path, cache_dir)
+            if not cache_path.exists():
+                return None
+            
+            df = pd.read_pickle(cache_path)
+            logger.info("使用缓存数据: %s, %d 行", Path(file_path).name, len(df))
+            CacheUtils._remember(key, df)
+            return df.copy(deep=False)
+            
+        except Exception as e:
+            logger.warning(f"读取缓存失败，将重新解析文件 {Path(file_path).name}: {e}")
+            return None
+    
+    @staticmethod
+    def save_dataframe(file_path: str, df: pd.DataFrame, cache_dir: Optional[Path] = None) -> bool:
+        """
+        保存文件的缓存数据
+        
+        Args:
+            file_path (str): 源文件路径
+            df (pd.DataFrame): 要缓存的数据
+            cache_dir (Path, optional): 缓存目录，不指定时按当前配置决定
+            
+        Returns:
+            bool: 是否保存成功
+        """
+        try:
+            cache_path = CacheUtils.get_cache_path(file_path, cache_dir)
+            if cache_path is None:
+                return False
+            
+            # 先写临时文件再替换，避免并行写入时读到不完整的缓存
+            temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            df.to_pickle(temp_path)
+            os.replace(temp_path, cache_path)
+            # 输入文件修改或缓存版本升级后，旧缓存不会再被命中，写入新缓存时一并删除
+            CacheUtils._prune_stale(cache_path, file_path)
+            # 内存中保存浅拷贝，调用方之后增删列不影响缓存
+            CacheUtils._remember(CacheUtils._file_signature(file_path), df.copy(deep=False))
+            return True
+            
+        except Exception as e:
+            logger.warning(f"保存缓存失败: {e}")
+            return False
+
 class DataUtils:
     """数据处理工具类"""
     
+    # 统计重复行时，行数达到该值才改用行哈希计数
+    HASH_DUPLICATE_MIN_ROWS = 10000
+    
+    # 分析列的取值，第一个为默认值
+    ANALYSIS_CATEGORIES = {
+        '类型': ['非程序Bug', '程序Bug'],
+        '修复状态': ['未修复', '已修复'],
+    }
+    
     @staticmethod
     def remove_useless_columns(df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -163,23 +429,45 @@ class DataUtils:
         
         # 删除无用列
         if cleaning_config.get('remove_unnamed_columns', True):
-            unnamed_patterns = cleaning_config.get('unnamed_column_patterns', ['Unnamed:', 'unnamed:'])
-            columns_to_drop = []
-            
-            for col in df.columns:
-                if any(pattern in str(col) for pattern in unnamed_patterns):
-                    columns_to_drop.append(col)
+            # 列名包含任一配置的文本即删除，所有文本合并为一个正则，对列名一次性向量化匹配
+            unnamed_pattern = config.get_unnamed_column_pattern()
+            drop_mask = (np.zeros(len(df.columns), dtype=bool) if unnamed_pattern is None else
+                         np.asarray(df.columns.astype(str).str.contains(unnamed_pattern), dtype=bool))
             
-            if columns_to_drop:
-                df = df.drop(columns=columns_to_drop)
-                logger.info(f"删除了无用列: {columns_to_drop}")
+            if drop_mask.any():
+                columns_to_drop = list(df.columns[drop_mask])
+                df = df.iloc[:, ~drop_mask]
+                logger.info("删除了无用列: %s", columns_to_drop)
         
         cleaned_shape = df.shape
-        logger.info(f"数据清理完成: 原有 {original_shape[0]} 行 {original_shape[1]} 列，"
-                   f"清理后 {cleaned_shape[0]} 行 {cleaned_shape[1]} 列")
+        logger.info("数据清理完成: 原有 %d 行 %d 列，清理后 %d 行 %d 列",
+                    original_shape[0], original_shape[1], cleaned_shape[0], cleaned_shape[1])
         
         return df
     
+    @staticmethod
+    def drop_empty_rows(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        删除完全为空的行并重新生成连续索引，结果与 dropna(how='all').reset_index(drop=True) 一致
+        
+        没有空行时不复制数据；有空行时只按位置取一次，直接替换索引而不再调用reset_index复制
+        
+        Args:
+            df (pd.DataFrame): 原始数据
+            
+        Returns:
+            pd.DataFrame: 删除空行后的数据
+        """
+        keep = df.notna().any(axis=1).to_numpy()
+        if keep.all():
+            if isinstance(df.index, pd.RangeIndex) and df.index.start == 0 and df.index.step == 1:
+                return df
+            df = df.copy(deep=False)
+        else:
+            df = df.iloc[keep]
+        df.index = pd.RangeIndex(len(df))
+        return df
+    
     @staticmethod
     def clean_empty_rows(df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -199,13 +487,13 @@ class DataUtils:
         # 删除完全为空的行
         cleaning_config = config.get_data_cleaning_config()
         if cleaning_config.get('remove_empty_rows', True):
-            df = df.dropna(how='all').reset_index(drop=True)
+            df = DataUtils.drop_empty_rows(df)
         
-        logger.info(f"  原始数据行数: {original_rows}")
-        logger.info(f"  处理后数据行数: {len(df)}")
+        logger.info("  原始数据行数: %d", original_rows)
+        logger.info("  处理后数据行数: %d", len(df))
         
         if len(df) < original_rows:
-            logger.info(f"  删除了 {original_rows - len(df)} 行完全为空的数据")
+            logger.info("  删除了 %d 行完全为空的数据", original_rows - len(df))
         
         return df
     
@@ -246,14 +534,60 @@ class DataUtils:
         
         report_config = config.get_report_config()
         
+        # 整列都是同一个值，用只有一个类别的category列存储，不为每行保存字符串引用
         if report_config.get('include_source_column', True):
-            df['文件来源'] = Path(source_file).name
+            df['文件来源'] = DataUtils.constant_column(Path(source_file).name, len(df))
         
         if report_config.get('include_timestamp', True):
-            df['处理时间'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            df['处理时间'] = DataUtils.constant_column(datetime.now().strftime('%Y-%m-%d %H:%M:%S'), len(df))
         
         return df
     
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def keyword_pattern(keywords: tuple) -> 're.Pattern':
+        """
+        将一组关键字编译为不区分大小写的正则，每个列名只需一次search
+        
+        Args:
+            keywords (tuple): 关键字
+            
+        Returns:
+            re.Pattern: 编译后的正则
+        """
+        return re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+    
+    @staticmethod
+    def match_columns(columns, keywords: tuple) -> List[Any]:
+        """
+        查找所有列名包含任一关键字的列（不区分大小写）
+        
+        Args:
+            columns: 列名
+            keywords (tuple): 关键字
+            
+        Returns:
+            List[Any]: 匹配的列名
+        """
+        search = DataUtils.keyword_pattern(keywords).search
+        return [col for col in columns if search(str(col))]
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def find_column(columns: tuple, keywords: tuple) -> Optional[Any]:
+        """
+        查找第一个列名包含任一关键字的列（不区分大小写），同一组列名和关键字只查找一次
+        
+        Args:
+            columns (tuple): 列名
+            keywords (tuple): 关键字
+            
+        Returns:
+            Optional[Any]: 匹配的列名，没有匹配时返回None
+        """
+        search = DataUtils.keyword_pattern(keywords).search
+        return next((col for col in columns if search(str(col))), None)
+    
     @staticmethod
     def detect_bug_columns(df: pd.DataFrame) -> Dict[str, Optional[str]]:
         """
@@ -281,34 +615,154 @@ class DataUtils:
             if any(keyword in str(col) for keyword in bug_columns):
                 result['bug_columns'].append(col)
         
+        columns = tuple(df.columns)
+        
         # 检测级别列
-        level_columns = bug_config.get('level_columns', [])
-        for col in df.columns:
-            if any(keyword in str(col).lower() for keyword in level_columns):
-                result['level_column'] = col
-                break
+        result['level_column'] = DataUtils.find_column(columns, tuple(bug_config.get('level_columns', [])))
         
         # 检测来源列
-        source_columns = bug_config.get('source_columns', [])
-        for col in df.columns:
-            if any(keyword in str(col).lower() for keyword in source_columns):
-                result['source_column'] = col
-                break
+        result['source_column'] = DataUtils.find_column(columns, tuple(bug_config.get('source_columns', [])))
         
         # 检测类型列
-        for col in df.columns:
-            if any(keyword in str(col).lower() for keyword in ['类型', 'type', '种类']):
-                result['type_column'] = col
-                break
+        result['type_column'] = DataUtils.find_column(columns, ('类型', 'type', '种类'))
         
         # 检测状态列
-        for col in df.columns:
-            if any(keyword in str(col).lower() for keyword in ['状态', 'status', '修复']):
-                result['status_column'] = col
-                break
+        result['status_column'] = DataUtils.find_column(columns, ('状态', 'status', '修复'))
         
         return result
     
+    @staticmethod
+    def value_counts_stable(series: pd.Series) -> pd.Series:
+        """
+        按值计数，按数量降序排列，数量相同时按值首次出现的顺序排列；
+        结果与列是object、category还是Arrow字符串类型无关
+        
+        Args:
+            series (pd.Series): 数据列
+            
+        Returns:
+            pd.Series: 以值为索引的计数，不含缺失值
+        """
+        codes, uniques = pd.factorize(series)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        order = np.argsort(-counts, kind='stable')
+        index = pd.Index(np.asarray(uniques, dtype=object)[order], dtype=object, name=series.name)
+        return pd.Series(counts[order], index=index, name='count')
+    
+    @staticmethod
+    def dtype_counts(df: pd.DataFrame) -> pd.Series:
+        """
+        按类型名称统计列数，category和字符串类型按其存储的值类型计（文本为object），
+        内存优化转换的类型不影响统计结果
+        
+        Args:
+            df (pd.DataFrame): 数据
+            
+        Returns:
+            pd.Series: 类型名称到列数，按列数降序、首次出现顺序排列
+        """
+        names = []
+        for dtype in df.dtypes:
+            if isinstance(dtype, pd.CategoricalDtype):
+                dtype = dtype.categories.dtype
+            elif isinstance(dtype, pd.StringDtype):
+                dtype = np.dtype(object)
+            names.append(str(dtype))
+        return DataUtils.value_counts_stable(pd.Series(names, dtype=object))
+    
+    @staticmethod
+    def count_nulls(df: pd.DataFrame) -> pd.Series:
+        """
+        逐列统计缺失值数量
+        
+        每次只为一列生成缺失值掩码，不像 df.isnull().sum() 那样先生成与整个数据框同样大小的布尔矩阵
+        
+        Args:
+            df (pd.DataFrame): 数据框
+            
+        Returns:
+            pd.Series: 以列名为索引的缺失值数量
+        """
+        counts = np.fromiter((df.iloc[:, idx].isna().sum() for idx in range(len(df.columns))),
+                             dtype=np.int64, count=len(df.columns))
+        return pd.Series(counts, index=df.columns)
+    
+    @staticmethod
+    def hash_rows(df: pd.DataFrame) -> np.ndarray:
+        """
+        计算每行数据的64位哈希值
+        
+        Args:
+            df (pd.DataFrame): 数据框
+            
+        Returns:
+            np.ndarray: uint64哈希数组
+        """
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+    
+    @staticmethod
+    def count_duplicate_rows(df: pd.DataFrame) -> int:
+        """
+        统计重复行数：先把每行压缩为一个哈希值，再用哈希表统计不同的行数，
+        不需要生成完整的布尔掩码
+        
+        Args:
+            df (pd.DataFrame): 数据框
+            
+        Returns:
+            int: 重复行数
+        """
+        # 行数较少时哈希的额外开销不划算，直接使用duplicated
+        if len(df) < DataUtils.HASH_DUPLICATE_MIN_ROWS:
+            return int(df.duplicated().sum())
+        
+        row_hashes = DataUtils.hash_rows(df)
+        return int(len(row_hashes) - len(pd.unique(row_hashes)))
+    
+    @staticmethod
+    def constant_column(value: Any, length: int) -> pd.Categorical:
+        """
+        生成整列都是同一个值的列，直接由类别编码构造，每行只占一个字节
+        
+        Args:
+            value (Any): 列值
+            length (int): 行数
+            
+        Returns:
+            pd.Categorical: 只有一个类别的列
+        """
+        return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), categories=[value])
+    
+    @staticmethod
+    def default_analysis_column(column: str, length: int) -> pd.Categorical:
+        """
+        生成填充默认值的分析列，直接由类别编码构造，每行只占一个字节
+        
+        Args:
+            column (str): 分析列名，'类型'或'修复状态'
+            length (int): 行数
+            
+        Returns:
+            pd.Categorical: 默认值列
+        """
+        return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8),
+                                         categories=DataUtils.ANALYSIS_CATEGORIES[column])
+    
+    @staticmethod
+    def as_category(series: pd.Series) -> pd.Series:
+        """
+        将低基数的文本列转为category类型，之后的相等比较和分组都按整数编码进行
+        
+        Args:
+            series (pd.Series): 文本列，已是其他类型时原样返回
+            
+        Returns:
+            pd.Series: category类型的列
+        """
+        if series.dtype == object:
+            return series.astype('category')
+        return series
+    
     @staticmethod
     def add_analysis_columns(df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -325,12 +779,12 @@ class DataUtils:
             
             # 添加类型列（默认为非程序Bug）
             if '类型' not in df.columns:
-                df['类型'] = '非程序Bug'
+                df['类型'] = DataUtils.default_analysis_column('类型', len(df))
                 logger.info("已添加'类型'列，默认值：非程序Bug")
             
             # 添加修复状态列（默认为未修复）
             if '修复状态' not in df.columns:
-                df['修复状态'] = '未修复'
+                df['修复状态'] = DataUtils.default_analysis_column('修复状态', len(df))
                 logger.info("已添加'修复状态'列，默认值：未修复")
             else:
                 # 为现有修复状态列设置默认值
@@ -346,6 +800,29 @@ class DataUtils:
 class TextUtils:
     """文本处理工具类"""
     
+    # 文件名解析用到的正则，预编译后各方法直接复用
+    DATE_PATTERNS = [
+        re.compile(r'记录(\d{4})'),  # 记录后面的4位数字
+        re.compile(r'bug记录(\d{4})'),  # bug记录后面的4位数字
+        re.compile(r'(\d{2})(\d{2})(?![\d])'),  # 4位数字但不是年份的一部分
+        re.compile(r'(\d{2}/\d{2})'),  # MM/DD格式
+        re.compile(r'(\d{2}-\d{2})'),  # MM-DD格式
+        re.compile(r'(\d{1,2})月(\d{1,2})日?'),  # 中文日期格式
+        re.compile(r'(\d{1,2})\.(\d{1,2})(?=\.|$)'),  # 点号分隔的日期格式（如8.13）
+    ]
+    
+    # 常见姓名列表（优先匹配）
+    COMMON_NAMES = ('胡先美', '王超', '李明', '张三', '李四', '王五', '赵六', '孙七')
+    
+    NAME_PATTERNS = [
+        re.compile(r'_([^_\.]+)\.xlsx?$'),  # 下划线后面的姓名
+        re.compile(r'([一-龯]{2,4})\.xlsx?$'),   # 文件名最后的中文姓名
+    ]
+    
+    CHINESE_CHAR_PATTERN = re.compile(r'[\u4e00-\u9fff]')
+    
+    NAME_EXCLUDE_WORDS = frozenset(['记录', '报告', '测试', '分析', '统计', '汇总', '名利场', '公司'])
+    
     @staticmethod
     def extract_date_from_filename(filename: str) -> Optional[str]:
         """
@@ -357,37 +834,21 @@ class TextUtils:
         Returns:
             Optional[str]: 提取的日期字符串
         """
-        if pd.isna(filename) or not isinstance(filename, str):
+        if not isinstance(filename, str):
             return None
         
-        # 日期提取模式
-        date_patterns = [
-            r'记录(\d{4})',  # 记录后面的4位数字
-            r'bug记录(\d{4})',  # bug记录后面的4位数字
-            r'(\d{2})(\d{2})(?![\d])',  # 4位数字但不是年份的一部分
-            r'(\d{2}/\d{2})',  # MM/DD格式
-            r'(\d{2}-\d{2})',  # MM-DD格式
-            r'(\d{1,2})月(\d{1,2})日?',  # 中文日期格式
-            r'(\d{1,2})\.(\d{1,2})(?=\.|$)',  # 点号分隔的日期格式（如8.13）
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, filename)
+        for pattern in TextUtils.DATE_PATTERNS:
+            match = pattern.search(filename)
             if match:
-                if len(match.groups()) == 1:
-                    date_str = match.group(1)
+                groups = match.groups()
+                if len(groups) == 1:
+                    date_str = groups[0]
                     if len(date_str) == 4 and not date_str.startswith('20'):
                         return date_str
-                elif len(match.groups()) == 2:
-                    month = match.group(1).zfill(2)
-                    day = match.group(2).zfill(2)
-                    return f"{month}{day}"
-                elif len(match.groups()) == 2:
-                    month = match.group(1).zfill(2)
-                    day = match.group(2).zfill(2)
-                    return f"{month}{day}"
-                elif '/' in match.group(1) or '-' in match.group(1):
-                    return match.group(1).replace('/', '').replace('-', '')
+                elif len(groups) == 2:
+                    return f"{groups[0].zfill(2)}{groups[1].zfill(2)}"
+                elif '/' in groups[0] or '-' in groups[0]:
+                    return groups[0].replace('/', '').replace('-', '')
         
         return None
     
@@ -402,39 +863,31 @@ class TextUtils:
         Returns:
             Optional[str]: 提取的测试人姓名
         """
-        if pd.isna(filename) or not isinstance(filename, str):
+        if not isinstance(filename, str):
             return "质检"
         
-        # 常见姓名列表（优先匹配）
-        common_names = ['胡先美', '王超', '李明', '张三', '李四', '王五', '赵六', '孙七']
-        for name in common_names:
+        for name in TextUtils.COMMON_NAMES:
             if name in filename:
                 return name
         
         # 正则表达式提取中文姓名
-        name_patterns = [
-            r'_([^_\.]+)\.xlsx?$',  # 下划线后面的姓名
-            r'([一-龯]{2,4})\.xlsx?$',   # 文件名最后的中文姓名
-        ]
-        
-        exclude_words = ['记录', '报告', '测试', '分析', '统计', '汇总', '名利场', '公司']
-        
-        for pattern in name_patterns:
-            match = re.search(pattern, filename)
+        for pattern in TextUtils.NAME_PATTERNS:
+            match = pattern.search(filename)
             if match:
                 potential_name = match.group(1)
-                if (re.search(r'[\u4e00-\u9fff]', potential_name) and 
+                if (TextUtils.CHINESE_CHAR_PATTERN.search(potential_name) and 
                     len(potential_name) <= 4 and 
-                    potential_name not in exclude_words):
+                    potential_name not in TextUtils.NAME_EXCLUDE_WORDS):
                     return potential_name
         
         # 默认返回质检
         return "质检"
     
     @staticmethod
+    @lru_cache(maxsize=1024)
     def extract_date_and_tester(filename: str) -> Optional[str]:
         """
-        从文件名中提取日期和测试人信息
+        从文件名中提取日期和测试人信息，同一文件名在多次分析之间只解析一次
         
         Args:
             filename (str): 文件名
@@ -452,15 +905,242 @@ class TextUtils:
             tester_name = "质检"
             
         return f"{date_str}_{tester_name}"
+    
+    @staticmethod
+    def extract_date_and_tester_series(filenames: pd.Series) -> pd.Series:
+        """
+        批量从文件名中提取日期和测试人信息
+        
+        同一来源文件的记录文件名相同，只对不重复的文件名做正则解析，再按编码映射回每一行
+        
+        Args:
+            filenames (pd.Series): 文件名列
+            
+        Returns:
+            pd.Series: 格式为"月日_姓名"的字符串，索引与输入一致
+        """
+        codes, uniques = pd.factorize(filenames)
+        # 末尾追加缺失值的解析结果，缺失值的编码-1正好取到它
+        extracted = np.array(
+            [TextUtils.extract_date_and_tester(name) for name in uniques]
+            + [TextUtils.extract_date_and_tester(None)],
+            dtype=object
+        )
+        return pd.Series(extracted[codes], index=filenames.index)
 
 class ExcelUtils:
     """Excel操作工具类"""
     
+    # 流式写入工作表时每次转换的行数
+    WRITE_CHUNK_ROWS = 10000
+    
+    @staticmethod
+    def rows_to_dataframe(data: List[list], usecols: Optional[List[Any]] = None) -> pd.DataFrame:
+        """
+        将工作表的行数据解析为DataFrame，使用pd.read_excel内部的同一个解析器，结果与其一致：
+        第一行作为表头（包括空行，此时列名为Unnamed: n），中间的空行保留为缺失值，
+        缺失值文本识别为缺失值，按列推断类型（如文本"001"解析为数值）
+        
+        Args:
+            data (List[list]): 每行的单元格值，格式与pandas的Excel读取器一致：
+                空单元格为空字符串，行尾空单元格和末尾空行已去掉，各行补齐为相同宽度
+            usecols (List[Any], optional): 只返回这些列
+            
+        Returns:
+            pd.DataFrame: 工作表数据
+        """
+        if not data:
+            return pd.DataFrame()
+        
+        try:
+            # 与pd.read_excel相同，不跳过空行
+            return TextParser(data, header=0, skip_blank_lines=False, usecols=usecols).read()
+        except EmptyDataError:
+            return pd.DataFrame()
+    
+    @staticmethod
+    def select_bug_sheet(sheet_names: List[str], read_header) -> str:
+        """
+        根据表头选择包含Bug记录的工作表，没有找到时使用第一个工作表
+        
+        Args:
+            sheet_names (List[str]): 工作表名列表
+            read_header: 根据工作表名读取列名的函数
+            
+        Returns:
+            str: 选中的工作表名
+        """
+        bug_columns = config.get_bug_columns()
+        
+        for sheet_name in sheet_names:
+            header = read_header(sheet_name)
+            logger.info("  检查工作表 '%s': %d 列", sheet_name, len(header))
+            
+            # 检查是否包含Bug记录相关的列，表头转为集合后按哈希查找
+            header_set = set(header)
+            matching_columns = [col for col in bug_columns if col in header_set]
+            
+            if matching_columns:
+                logger.info("  找到Bug记录工作表: %s, 匹配列: %s", sheet_name, matching_columns)
+                return sheet_name
+        
+        logger.info("  未找到Bug记录工作表，使用默认工作表: %s", sheet_names[0])
+        return sheet_names[0]
+    
+    @staticmethod
+    def _calamine_sheet_data(sheet, nrows: Optional[int] = None) -> List[list]:
+        """
+        读取calamine工作表的单元格值，按pandas的openpyxl读取器的规则转换：
+        空单元格为空字符串，整数值的浮点数转为整数，日期转为datetime，
+        去掉行尾空单元格和末尾空行，再把各行补齐为相同宽度
+        
+        Args:
+            sheet: python-calamine的工作表
+            nrows (int, optional): 最多读取的行数
+            
+        Returns:
+            List[list]: 每行的单元格值
+        """
+        data = []
+        last_row_with_data = -1
+        # 保留表头之前的空行和左侧的空列，与openpyxl读取的单元格位置一致
+        for row_number, row in enumerate(sheet.to_python(skip_empty_area=False, nrows=nrows)):
+            # 单元格转换在推导式内联完成，不在每个单元格上做方法调用
+            converted_row = [
+                int(value) if value.__class__ is float and value.is_integer() else
+                datetime(value.year, value.month, value.day) if value.__class__ is date else value
+                for value in row
+            ]
+            while converted_row and converted_row[-1] == '':
+                converted_row.pop()
+            if converted_row:
+                last_row_with_data = row_number
+            data.append(converted_row)
+        
+        data = data[:last_row_with_data + 1]
+        if data:
+            max_width = max(len(row) for row in data)
+            data = [row + [''] * (max_width - len(row)) if len(row) < max_width else row for row in data]
+        return data
+    
+    @staticmethod
+    def _read_bug_sheet_calamine(file_path: str) -> pd.DataFrame:
+        """
+        使用python-calamine读取Bug记录工作表
+        
+        Args:
+            file_path (str): Excel文件路径
+            
+        Returns:
+            pd.DataFrame: 工作表数据
+        """
+        from python_calamine import CalamineWorkbook
+        
+        workbook = CalamineWorkbook.from_path(file_path)
+        # calamine获取工作表时会解析整个工作表，保留结果供选中后直接使用
+        sheets = {}
+        
+        def get_sheet(sheet_name):
+            if sheet_name not in sheets:
+                sheets[sheet_name] = workbook.get_sheet_by_name(sheet_name)
+            return sheets[sheet_name]
+        
+        def read_header(sheet_name):
+            # 与pd.read_excel(nrows=0)一致，只解析第一行作为列名
+            return ExcelUtils.rows_to_dataframe(ExcelUtils._calamine_sheet_data(get_sheet(sheet_name), nrows=1)).columns
+        
+        main_sheet = ExcelUtils.select_bug_sheet(workbook.sheet_names, read_header)
+        return ExcelUtils.rows_to_dataframe(ExcelUtils._calamine_sheet_data(get_sheet(main_sheet)))
+    
+    @staticmethod
+    def _read_bug_sheet_openpyxl(file_path: str) -> pd.DataFrame:
+        """
+        使用pd.read_excel读取Bug记录工作表：工作簿只打开一次，
+        其他工作表只读取第一行判断列名，只有选中的工作表被完整解析
+        
+        Args:
+            file_path (str): Excel文件路径
+            
+        Returns:
+            pd.DataFrame: 工作表数据
+        """
+        with pd.ExcelFile(file_path, engine='openpyxl') as excel_file:
+            main_sheet = ExcelUtils.select_bug_sheet(
+                excel_file.sheet_names, lambda sheet_name: excel_file.parse(sheet_name, nrows=0).columns)
+            return excel_file.parse(main_sheet)
+    
+    @staticmethod
+    def read_excel(file_path: str, sheet_name=0, usecols: Optional[List[Any]] = None) -> pd.DataFrame:
+        """
+        读取单个工作表，安装了python-calamine时使用calamine解析，否则使用pd.read_excel；
+        两种方式使用同一个解析器，结果都与pd.read_excel一致（第一行作为表头，空行保留）
+        
+        Args:
+            file_path (str): Excel文件路径
+            sheet_name (int or str): 工作表序号或名称
+            usecols (List[Any], optional): 只返回这些列
+            
+        Returns:
+            pd.DataFrame: 工作表数据
+        """
+        df = None
+        if _HAS_CALAMINE:
+            try:
+                from python_calamine import CalamineWorkbook
+                
+                workbook = CalamineWorkbook.from_path(file_path)
+                if isinstance(sheet_name, int):
+                    sheet = workbook.get_sheet_by_index(sheet_name)
+                else:
+                    sheet = workbook.get_sheet_by_name(sheet_name)
+                df = ExcelUtils.rows_to_dataframe(ExcelUtils._calamine_sheet_data(sheet), usecols=usecols)
+            except Exception as e:
+                logger.warning(f"calamine读取失败，改用openpyxl: {e}")
+        
+        if df is None:
+            df = pd.read_excel(file_path, sheet_name=sheet_name, usecols=usecols)
+        return df
+    
+    @staticmethod
+    def count_data_rows(file_path: str, sheet_name=0) -> int:
+        """
+        流式统计工作表的数据行数，不生成DataFrame
+        
+        与pd.read_excel读取后的行数一致：第一行为表头不计入，中间的空行计入，末尾的空行不计入
+        
+        Args:
+            file_path (str): Excel文件路径
+            sheet_name (int or str): 工作表序号或名称
+            
+        Returns:
+            int: 数据行数
+        """
+        workbook = load_workbook(file_path, read_only=True, data_only=True, keep_vba=False)
+        try:
+            if isinstance(sheet_name, int):
+                worksheet = workbook.worksheets[sheet_name]
+            else:
+                worksheet = workbook[sheet_name]
+            
+            # 工作表记录的max_row会包含带格式的空行，因此逐行找到最后一个有值的行；
+            # 与pandas读取时一样，空字符串也视为空单元格
+            worksheet.reset_dimensions()
+            last_row_with_data = 0
+            for row_number, row in enumerate(worksheet.iter_rows(values_only=True)):
+                if any(value is not None and value != '' for value in row):
+                    last_row_with_data = row_number
+            return last_row_with_data
+        finally:
+            workbook.close()
+    
     @staticmethod
     def read_excel_smart(file_path: str) -> pd.DataFrame:
         """
         智能读取Excel文件，自动检测Bug记录工作表
         
+        先只读取各工作表的表头判断是否为Bug记录，再只把选中的工作表读取为DataFrame；
+        安装了python-calamine时使用calamine解析，失败时改用openpyxl
+        
         Args:
             file_path (str): Excel文件路径
             
@@ -468,40 +1148,27 @@ class ExcelUtils:
             pd.DataFrame: 读取的数据
         """
         try:
-            logger.info(f"正在读取文件: {Path(file_path).name}")
-            
-            # 读取所有工作表
-            all_sheets = pd.read_excel(file_path, sheet_name=None, engine='openpyxl')
+            logger.info("正在读取文件: %s", Path(file_path).name)
             
-            # 查找包含Bug记录的工作表
-            bug_columns = config.get_bug_columns()
             main_df = None
+            if _HAS_CALAMINE:
+                try:
+                    main_df = ExcelUtils._read_bug_sheet_calamine(file_path)
+                except Exception as e:
+                    logger.warning(f"calamine读取失败，改用openpyxl: {e}")
             
-            for sheet_name, df in all_sheets.items():
-                logger.info(f"  检查工作表 '{sheet_name}': {len(df)} 行 {len(df.columns)} 列")
-                
-                # 检查是否包含Bug记录相关的列
-                matching_columns = [col for col in bug_columns if col in df.columns]
-                
-                if matching_columns:
-                    logger.info(f"  找到Bug记录工作表: {sheet_name}, 匹配列: {matching_columns}")
-                    main_df = df
-                    break
-            
-            # 如果没找到Bug记录工作表，使用第一个工作表
             if main_df is None:
-                main_df = list(all_sheets.values())[0]
-                logger.info(f"  使用默认工作表，包含 {len(main_df)} 行数据")
+                main_df = ExcelUtils._read_bug_sheet_openpyxl(file_path)
             
             # 删除完全为空的行
             original_rows = len(main_df)
-            main_df = main_df.dropna(how='all').reset_index(drop=True)
+            main_df = DataUtils.drop_empty_rows(main_df)
             
-            logger.info(f"  原始数据行数: {original_rows}")
-            logger.info(f"  处理后数据行数: {len(main_df)}")
+            logger.info("  原始数据行数: %d", original_rows)
+            logger.info("  处理后数据行数: %d", len(main_df))
             
             if len(main_df) < original_rows:
-                logger.info(f"  删除了 {original_rows - len(main_df)} 行完全为空的数据")
+                logger.info("  删除了 %d 行完全为空的数据", original_rows - len(main_df))
             
             return main_df
             
@@ -509,6 +1176,175 @@ class ExcelUtils:
             logger.error(f"读取文件 {Path(file_path).name} 时出错: {e}")
             return pd.DataFrame()
     
+    @staticmethod
+    def get_writer_kwargs(engine: str) -> Dict[str, Any]:
+        """
+        获取ExcelWriter的引擎参数
+        
+        Args:
+            engine (str): 写入引擎
+            
+        Returns:
+            Dict[str, Any]: 传给pd.ExcelWriter的额外参数
+        """
+        if engine != 'xlsxwriter':
+            return {}
+        
+        excel_config = config.get_excel_config()
+        return {
+            'engine_kwargs': {
+                'options': {
+                    # 逐行写入磁盘，内存占用与行数无关
+                    'constant_memory': excel_config.get('constant_memory', True),
+                    # 文本原样写入：'=== 数据规模 ==='之类以等号开头的文本不能当作公式
+                    'strings_to_numbers': False,
+                    'strings_to_formulas': False,
+                    'strings_to_urls': False,
+                    # 与pandas的datetime_format默认值一致；只有日期的值在write_sheet中按日期格式写入
+                    'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+                }
+            }
+        }
+    
+    @staticmethod
+    def write_sheet(writer: pd.ExcelWriter, sheet_name: str, df: pd.DataFrame, index: bool = False):
+        """
+        将DataFrame写入工作表
+        
+        xlsxwriter引擎下按行流式写入：constant_memory模式只保留当前行，
+        而DataFrame.to_excel按列输出单元格，因此不能直接使用to_excel
+        
+        Args:
+            writer (pd.ExcelWriter): Excel写入器
+            sheet_name (str): 工作表名
+            df (pd.DataFrame): 要写入的数据
+            index (bool): 是否写入索引
+        """
+        if writer.engine != 'xlsxwriter':
+            df.to_excel(writer, sheet_name=sheet_name, index=index)
+            return
+        
+        if index:
+            df = df.reset_index()
+        
+        worksheet = writer.book.add_worksheet(sheet_name)
+        header_format = writer.book.add_format({'bold': True, 'border': 1, 'align': 'center'})
+        worksheet.write_row(0, 0, list(df.columns), header_format)
+        
+        # 与pandas一致，只有日期（不含时间）的值使用 yyyy-mm-dd 格式，其他日期时间使用默认格式
+        date_columns = ExcelUtils._date_only_columns(df)
+        date_format = writer.book.add_format({'num_format': 'yyyy-mm-dd'}) if date_columns else None
+        
+        # 按行分块写入，每次只把一块数据转为Python对象，内存占用与总行数无关
+        for start in range(0, len(df), ExcelUtils.WRITE_CHUNK_ROWS):
+            columns = ExcelUtils._native_columns(df.iloc[start:start + ExcelUtils.WRITE_CHUNK_ROWS])
+            for row_idx, row in enumerate(zip(*columns), start=start + 1):
+                worksheet.write_row(row_idx, 0, row)
+                # 仍在当前行，constant_memory模式下可以覆盖刚写入的单元格
+                for col_idx in date_columns:
+                    value = row[col_idx]
+                    if value.__class__ is date:
+                        worksheet.write_datetime(row_idx, col_idx, value, date_format)
+    
+    @staticmethod
+    def _date_only_columns(df: pd.DataFrame) -> List[int]:
+        """
+        查找包含只有日期（datetime.date）值的object列
+        
+        Args:
+            df (pd.DataFrame): 要写入的数据
+            
+        Returns:
+            List[int]: 列位置
+        """
+        date_columns = []
+        for idx in range(len(df.columns)):
+            series = df.iloc[:, idx]
+            if series.dtype != object:
+                continue
+            inferred = pd.api.types.infer_dtype(series, skipna=True)
+            if inferred == 'date' or (inferred == 'mixed'
+                                      and any(value.__class__ is date for value in series.to_numpy())):
+                date_columns.append(idx)
+        return date_columns
+    
+    # xlsxwriter可以直接写入的单元格值类型
+    _CELL_TYPES = (str, bool, int, float, datetime, date, time)
+    
+    # infer_dtype结果为这些类型时，object列中的值都可以直接写入，不必逐个检查
+    _CELL_INFERRED = frozenset(['string', 'empty', 'boolean', 'integer', 'date', 'datetime', 'time'])
+    
+    @staticmethod
+    def _cell_value(value: Any) -> Any:
+        """
+        将单个值转换为可写入单元格的值，规则与DataFrame.to_excel一致：
+        numpy标量转为Python标量，正负无穷写为'inf'/'-inf'，其他对象写为str()
+        
+        Args:
+            value (Any): 单元格值，缺失值已替换为None
+            
+        Returns:
+            Any: 可写入的值
+        """
+        if value is None:
+            return None
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float):
+            if np.isinf(value):
+                return 'inf' if value > 0 else '-inf'
+            return value
+        if isinstance(value, ExcelUtils._CELL_TYPES):
+            return value
+        return str(value)
+    
+    @staticmethod
+    def _native_columns(df: pd.DataFrame) -> List[np.ndarray]:
+        """
+        将DataFrame逐列转为Python原生对象数组，缺失值替换为None（写为空单元格），
+        正负无穷和非基本类型的对象按DataFrame.to_excel的规则转换
+        
+        xlsxwriter对int/float/str/datetime按类型直接分派，numpy标量和Timestamp要走较慢的兼容判断
+        
+        Args:
+            df (pd.DataFrame): 要写入的数据
+            
+        Returns:
+            List[np.ndarray]: 每列一个object数组
+        """
+        columns = []
+        for idx in range(len(df.columns)):
+            series = df.iloc[:, idx]
+            # 每列只计算一次缺失值掩码
+            null_mask = series.isna().to_numpy()
+            has_null = null_mask.any()
+            if pd.api.types.is_datetime64_dtype(series.dtype):
+                column_values = pd.DatetimeIndex(series).to_pydatetime()
+            else:
+                if (series.dtype == object
+                        and pd.api.types.infer_dtype(series, skipna=True) in ('integer', 'floating', 'mixed-integer-float')):
+                    # 存放numpy数值标量的object列先转为数值列，再转换出的就是Python数值
+                    series = pd.to_numeric(series)
+                # 数值列转为object时总会生成新数组，只有object列需要复制后才能修改
+                column_values = series.to_numpy(dtype=object, copy=has_null)
+                if pd.api.types.is_float_dtype(series.dtype):
+                    # xlsxwriter不能写入非有限的数值，与to_excel的inf_rep一致写为文本
+                    float_values = series.to_numpy(dtype=float, na_value=np.nan)
+                    inf_mask = np.isinf(float_values)
+                    if inf_mask.any():
+                        column_values[inf_mask] = np.where(float_values[inf_mask] > 0, 'inf', '-inf')
+                elif (not pd.api.types.is_numeric_dtype(series.dtype)
+                        and pd.api.types.infer_dtype(column_values, skipna=True) not in ExcelUtils._CELL_INFERRED):
+                    # 混合类型、Decimal、Timedelta、列表等逐个转换，缺失值在下面统一替换
+                    converted = np.empty(len(column_values), dtype=object)
+                    converted[:] = [None if is_null else ExcelUtils._cell_value(value)
+                                    for value, is_null in zip(column_values, null_mask)]
+                    column_values = converted
+            if has_null:
+                column_values[null_mask] = None
+            columns.append(column_values)
+        return columns
+    
     @staticmethod
     def save_excel_with_sheets(file_path: str, sheets_data: Dict[str, pd.DataFrame]) -> bool:
         """
@@ -523,17 +1359,18 @@ class ExcelUtils:
         """
         try:
             excel_config = config.get_excel_config()
+            engine = excel_config.get('engine', 'xlsxwriter')
             
-            with pd.ExcelWriter(file_path, engine=excel_config.get('engine', 'openpyxl')) as writer:
+            with pd.ExcelWriter(file_path, engine=engine, **ExcelUtils.get_writer_kwargs(engine)) as writer:
                 for sheet_name, df in sheets_data.items():
                     if not df.empty:
-                        df.to_excel(writer, sheet_name=sheet_name, 
-                                  index=excel_config.get('index', False))
+                        ExcelUtils.write_sheet(writer, sheet_name, df, 
+                                               index=excel_config.get('index', False))
                         logger.info(f"工作表 '{sheet_name}': {len(df)} 行 {len(df.columns)} 列")
                     else:
                         # 创建空数据说明
                         empty_df = pd.DataFrame({'说明': [f'{sheet_name}数据为空']})
-                        empty_df.to_excel(writer, sheet_name=sheet_name, index=False)
+                        ExcelUtils.write_sheet(writer, sheet_name, empty_df, index=False)
                         logger.warning(f"工作表 '{sheet_name}' 数据为空")
             
             logger.info(f"已保存Excel文件: {Path(file_path).name}")